@@ -3,6 +3,7 @@ import pytest
 import yaml
 import os
 
+from glob import glob
 from pathlib import Path
 from gqlalchemy import Memgraph, Node, Relationship, Path as path_gql
 from mgclient import Node as node_mgclient
@@ -223,8 +224,13 @@ def _test_export(test_dir: Path, db: Memgraph):
     db.execute("MATCH (n) DETACH DELETE n;")
     db.execute(import_query)
 
+    # chunked exports write <file>.part<i> files instead of <file>
+    exported_files = glob(f"{TestConstants.EXPORT_TEST_E2E_OUTPUT_FILE}*")
     try:
-        os.remove(TestConstants.EXPORT_TEST_E2E_OUTPUT_FILE)
+        if not exported_files:
+            raise FileNotFoundError(TestConstants.EXPORT_TEST_E2E_OUTPUT_FILE)
+        for exported_file in exported_files:
+            os.remove(exported_file)
     except Exception:
         raise OSError("Could not delete file.")
 
@@ -301,4 +307,3 @@ def test_end2end(test_dir: Path, db: Memgraph):
     db.drop_database()
     db.drop_indexes()
     db.ensure_constraints([])
-   
@@ -5,16 +5,55 @@ import mgp
 import gqlalchemy
 import os
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, date, time, timedelta
 from gqlalchemy import Memgraph
+from itertools import chain
 from math import floor
 
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+from xml.sax.saxutils import escape
 
 from mage.export_import_util.parameters import Parameter
 
 HEADER_FILENAME = "header.csv"
+FILE_BUFFER_SIZE = 1 << 20
+TEMPORAL_TYPES = (timedelta, time, datetime, date)
+
+# Parameter values are resolved once, they are used for every exported element
+ID_KEY = Parameter.ID.value
+LABELS_KEY = Parameter.LABELS.value
+PROPERTIES_KEY = Parameter.PROPERTIES.value
+TYPE_KEY = Parameter.TYPE.value
+END_KEY = Parameter.END.value
+LABEL_KEY = Parameter.LABEL.value
+START_KEY = Parameter.START.value
+NODE_TYPE = Parameter.NODE.value
+RELATIONSHIP_TYPE = Parameter.RELATIONSHIP.value
+DURATION_PREFIX = Parameter.DURATION.value
+LOCALTIME_PREFIX = Parameter.LOCALTIME.value
+LOCALDATETIME_PREFIX = Parameter.LOCALDATETIME.value
+DATE_PREFIX = Parameter.DATE.value
+STANDARD_INDENT = Parameter.STANDARD_INDENT.value
+
+# bool has to precede int, since bool is a subclass of int
+GRAPHML_TYPES = {str: "string", bool: "boolean", float: "float", int: "int"}
+XML_ATTRIBUTE_ENTITIES = {'"': "&quot;"}
+GRAPHML_DEFAULT_CONFIG = {
+    "stream": False,
+    "format": "",
+    "caption": tuple(),
+    "useTypes": False,
+    "leaveOutLabels": False,
+    "leaveOutProperties": False,
+    "chunks": 1,
+}
+GRAPHML_KEY_TEMPLATE = '<key id="{id}" for="{is_for}" attr.name="{name}"/>\n'
+GRAPHML_TYPED_KEY_TEMPLATE = (
+    '<key id="{id}" for="{is_for}" attr.name="{name}" attr.type="{type}"/>\n'
+)
+GRAPHML_TYPED_LIST_KEY_TEMPLATE = '<key id="{id}" for="{is_for}" attr.name="{name}" attr.type="string" attr.list="{type}"/>\n'  # noqa: E501
 
 
 @dataclass
@@ -25,10 +64,10 @@ class Node:
 
     def get_dict(self) -> dict:
         return {
-            Parameter.ID.value: self.id,
-            Parameter.LABELS.value: self.labels,
-            Parameter.PROPERTIES.value: self.properties,
-            Parameter.TYPE.value: Parameter.NODE.value,
+            ID_KEY: self.id,
+            LABELS_KEY: self.labels,
+            PROPERTIES_KEY: self.properties,
+            TYPE_KEY: NODE_TYPE,
         }
 
 
@@ -43,12 +82,12 @@ class Relationship:
 
     def get_dict(self) -> dict:
         return {
-            Parameter.END.value: self.end,
-            Parameter.ID.value: self.id,
-            Parameter.LABEL.value: self.label,
-            Parameter.PROPERTIES.value: self.properties,
-            Parameter.START.value: self.start,
-            Parameter.TYPE.value: Parameter.RELATIONSHIP.value,
+            END_KEY: self.end,
+            ID_KEY: self.id,
+            LABEL_KEY: self.label,
+            PROPERTIES_KEY: self.properties,
+            START_KEY: self.start,
+            TYPE_KEY: RELATIONSHIP_TYPE,
         }
 
 
@@ -113,17 +152,20 @@ def convert_to_isoformat(
         date,
     ]
 ):
+    if not isinstance(property, TEMPORAL_TYPES):
+        return property
+
     if isinstance(property, timedelta):
-        return Parameter.DURATION.value + str(property) + ")"
+        return DURATION_PREFIX + str(property) + ")"
 
     elif isinstance(property, time):
-        return Parameter.LOCALTIME.value + property.isoformat() + ")"
+        return LOCALTIME_PREFIX + property.isoformat() + ")"
 
     elif isinstance(property, datetime):
-        return Parameter.LOCALDATETIME.value + property.isoformat() + ")"
+        return LOCALDATETIME_PREFIX + property.isoformat() + ")"
 
     elif isinstance(property, date):
-        return Parameter.DATE.value + property.isoformat() + ")"
+        return DATE_PREFIX + property.isoformat() + ")"
 
     else:
         return property
@@ -210,8 +252,8 @@ def convert_to_cypher_format(
 def get_properties_cypher(object, write_properties: bool) -> dict:
     return (
         {
-            key: convert_to_cypher_format(object.properties.get(key))
-            for key in object.properties.keys()
+            key: convert_to_cypher_format(value)
+            for key, value in object.properties.items()
         }
         if write_properties
         else {}
@@ -354,10 +396,7 @@ def cypher_all(
 
 def get_properties_json(object, write_properties: bool):
     return (
-        {
-            key: convert_to_isoformat(object.properties.get(key))
-            for key in object.properties.keys()
-        }
+        {key: convert_to_isoformat(value) for key, value in object.properties.items()}
         if write_properties
         else {}
     )
@@ -378,42 +417,45 @@ def convert_to_isoformat_graphML(
         date,
     ]
 ):
+    if not isinstance(property, TEMPORAL_TYPES):
+        return property
+
     if isinstance(property, timedelta):
         return to_duration_iso_format(property)
 
-    if isinstance(property, (time, date, datetime)):
-        return property.isoformat()
-
-    else:
-        return property
+    return property.isoformat()
 
 
-def get_graph(
+def get_graph_iter(
     ctx: mgp.ProcCtx, write_properties: bool
-) -> List[Union[Node, Relationship]]:
-    nodes = list()
-    relationships = list()
-
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yields the exported nodes followed by the exported relationships, one
+    element at a time, so the whole graph never has to be held in memory.
+    """
     for vertex in ctx.graph.vertices:
         labels = [label.name for label in vertex.labels]
         properties = get_properties_json(vertex, write_properties)
 
-        nodes.append(Node(vertex.id, labels, properties).get_dict())
+        yield {
+            ID_KEY: vertex.id,
+            LABELS_KEY: labels,
+            PROPERTIES_KEY: properties,
+            TYPE_KEY: NODE_TYPE,
+        }
 
+    for vertex in ctx.graph.vertices:
         for edge in vertex.out_edges:
             properties = get_properties_json(edge, write_properties)
 
-            relationships.append(
-                Relationship(
-                    edge.to_vertex.id,
-                    edge.id,
-                    edge.type.name,
-                    properties,
-                    edge.from_vertex.id,
-                ).get_dict()
-            )
-
-    return nodes + relationships
+            yield {
+                END_KEY: edge.to_vertex.id,
+                ID_KEY: edge.id,
+                LABEL_KEY: edge.type.name,
+                PROPERTIES_KEY: properties,
+                START_KEY: edge.from_vertex.id,
+                TYPE_KEY: RELATIONSHIP_TYPE,
+            }
 
 
 def get_graphML(
@@ -423,7 +465,7 @@ def get_graphML(
         "leaveOutLabels": False,
         "leaveOutProperties": False,
     },
-) -> List[Union[Node, Relationship]]:
+) -> List[Dict[str, Any]]:
     """
     config : Map
         - graphML: bool
@@ -434,39 +476,48 @@ def get_graphML(
     nodes = list()
     relationships = list()
 
+    convert_vertex_property = (
+        convert_to_isoformat_graphML if config.get("graphML") else convert_to_isoformat
+    )
+    write_labels = not config.get("leaveOutLabels")
+    write_properties = not config.get("leaveOutProperties")
+
     for vertex in ctx.graph.vertices:
         labels = []
         properties = dict()
-        if not config.get("leaveOutLabels"):
+        if write_labels:
             labels = [label.name for label in vertex.labels]
-        if config.get("graphML") and not config.get("leaveOutProperties"):
-            properties = {
-                key: convert_to_isoformat_graphML(vertex.properties.get(key))
-                for key in vertex.properties.keys()
-            }
-        elif not config.get("leaveOutProperties"):
+        if write_properties:
             properties = {
-                key: convert_to_isoformat(vertex.properties.get(key))
-                for key in vertex.properties.keys()
+                key: convert_vertex_property(value)
+                for key, value in vertex.properties.items()
             }
 
-        nodes.append(Node(vertex.id, labels, properties).get_dict())
+        nodes.append(
+            {
+                ID_KEY: vertex.id,
+                LABELS_KEY: labels,
+                PROPERTIES_KEY: properties,
+                TYPE_KEY: NODE_TYPE,
+            }
+        )
 
         for edge in vertex.out_edges:
-            if not config.get("leaveOutProperties"):
+            if write_properties:
                 properties = {
-                    key: convert_to_isoformat(edge.properties.get(key))
-                    for key in edge.properties.keys()
+                    key: convert_to_isoformat(value)
+                    for key, value in edge.properties.items()
                 }
 
             relationships.append(
-                Relationship(
-                    edge.to_vertex.id,
-                    edge.id,
-                    edge.type.name,
-                    properties,
-                    edge.from_vertex.id,
-                ).get_dict()
+                {
+                    END_KEY: edge.to_vertex.id,
+                    ID_KEY: edge.id,
+                    LABEL_KEY: edge.type.name,
+                    PROPERTIES_KEY: properties,
+                    START_KEY: edge.from_vertex.id,
+                    TYPE_KEY: RELATIONSHIP_TYPE,
+                }
             )
 
     return nodes + relationships
@@ -474,7 +525,7 @@ def get_graphML(
 
 def get_graph_from_list(
     graph_vertices: list, graph_edges: list, write_properties: bool
-) -> List[Union[Node, Relationship]]:
+) -> List[Dict[str, Any]]:
     nodes = list()
     relationships = list()
 
@@ -482,19 +533,27 @@ def get_graph_from_list(
         labels = [label.name for label in vertex.labels]
         properties = get_properties_json(vertex, write_properties)
 
-        nodes.append(Node(vertex.id, labels, properties).get_dict())
+        nodes.append(
+            {
+                ID_KEY: vertex.id,
+                LABELS_KEY: labels,
+                PROPERTIES_KEY: properties,
+                TYPE_KEY: NODE_TYPE,
+            }
+        )
 
     for edge in graph_edges:
         properties = get_properties_json(edge, write_properties)
 
         relationships.append(
-            Relationship(
-                edge.to_vertex.id,
-                edge.id,
-                edge.type.name,
-                properties,
-                edge.from_vertex.id,
-            ).get_dict()
+            {
+                END_KEY: edge.to_vertex.id,
+                ID_KEY: edge.id,
+                LABEL_KEY: edge.type.name,
+                PROPERTIES_KEY: properties,
+                START_KEY: edge.from_vertex.id,
+                TYPE_KEY: RELATIONSHIP_TYPE,
+            }
         )
 
     return nodes + relationships
@@ -537,23 +596,46 @@ def get_graph_info_from_lists(
     return graph, all_node_properties, all_relationship_properties
 
 
-def json_dump_to_file(graph: List[Union[Node, Relationship]], path: str):
+def write_json_array(graph: Iterable[Dict[str, Any]], outfile) -> None:
+    """
+    Writes the graph elements as an indented JSON array, encoding one element
+    at a time. The output is identical to json.dump(list(graph), indent=...).
+    """
+    encoder = js.JSONEncoder(indent=STANDARD_INDENT, default=str)
+    indent = " " * STANDARD_INDENT
+    separator = "[\n"
+    for element in graph:
+        outfile.write(separator)
+        outfile.write(indent)
+        outfile.write(encoder.encode(element).replace("\n", "\n" + indent))
+        separator = ",\n"
+    outfile.write("\n]" if separator == ",\n" else "[]")
+
+
+def json_dump_to_file(graph: Iterable[Dict[str, Any]], path: str):
+    """
+    Only I/O errors are reported as file errors, errors raised while the graph
+    elements are read or encoded are propagated unchanged.
+    """
     try:
-        with open(path, "w") as outfile:
-            js.dump(
-                graph,
-                outfile,
-                indent=Parameter.STANDARD_INDENT.value,
-                default=str,
-            )
+        with open(path, "w", buffering=FILE_BUFFER_SIZE) as outfile:
+            write_json_array(graph, outfile)
     except PermissionError:
         raise PermissionError(
             "You don't have permissions to write into that file. Make sure to give the necessary permissions to user memgraph."  # noqa: E501
         )
-    except Exception:
+    except OSError:
         raise OSError("Could not open or write to the file.")
 
 
+def json_dumps_stream(graph: Iterable[Dict[str, Any]]) -> str:
+    """
+    Encodes the graph elements one at a time. The output is identical to
+    json.dumps(list(graph)).
+    """
+    return "[" + ", ".join(js.dumps(element) for element in graph) + "]"
+
+
 @mgp.read_proc
 def json(
     ctx: mgp.ProcCtx, path: str = "", config: mgp.Map = {}
@@ -578,13 +660,18 @@ def json(
         PermissionError: If you provided file path that you have no permissions to write at.
         OSError: If the file can't be opened or written to.
     """
-    graph = get_graph(ctx, config.get("write_properties", True))
+    stream = config.get("stream", False)
+    graph = get_graph_iter(ctx, config.get("write_properties", True))
+    # the graph is walked once, elements are kept only if both outputs need them
+    if path and stream:
+        graph = list(graph)
+
     if path:
         json_dump_to_file(graph, path)
 
     return mgp.Record(
         path=path,
-        data=js.dumps(graph) if config.get("stream", False) else "",
+        data=json_dumps_stream(graph) if stream else "",
     )
 
 
@@ -626,17 +713,18 @@ def json_graph(
 
     return mgp.Record(
         path=path,
-        data=js.dumps(graph) if config.get("stream", False) else "",
+        data=json_dumps_stream(graph) if config.get("stream", False) else "",
     )
 
 
-def save_file(file_path: str, data_list: list):
+def save_file(file_path: str, data_list: Iterable[List[Any]]):
     try:
         with open(
             file_path,
             "w",
             newline="",
             encoding="utf8",
+            buffering=FILE_BUFFER_SIZE,
         ) as f:
             writer = csv.writer(f)
             writer.writerows(data_list)
@@ -650,12 +738,16 @@ def save_file(file_path: str, data_list: list):
                 file_path, writer.line_num, e
             )
         )
-    except Exception:
+    # rows can be fetched lazily while they are written, errors raised while
+    # fetching them are not file errors and are propagated unchanged
+    except OSError:
         raise OSError("Could not open or write to the file.")
 
 
 def csv_to_stream(
-    data_list: list, delimiter: str = ",", quoting_type=csv.QUOTE_NONNUMERIC
+    data_list: Iterable[List[Any]],
+    delimiter: str = ",",
+    quoting_type=csv.QUOTE_NONNUMERIC,
 ) -> str:
     output = io.StringIO()
     try:
@@ -796,7 +888,7 @@ def header_path(path: str):
 
 
 def write_file(path: str, delimiter: str, quoting_type: str, data: mgp.Any) -> None:
-    with open(path, "w") as file:
+    with open(path, "w", buffering=FILE_BUFFER_SIZE) as file:
         writer = csv.writer(
             file, delimiter=delimiter, quoting=quoting_type, escapechar="\\"
         )
@@ -928,16 +1020,23 @@ def csv_query(
         )
 
     memgraph = Memgraph()
-    results = list(memgraph.execute_and_fetch(query))
+    results = memgraph.execute_and_fetch(query)
+    first_result = next(results, None)
 
     # if query yields no result
-    if not len(results):
+    if first_result is None:
         raise Exception(
             "Your query yields no results. Check if the database is empty or rewrite the provided query."  # noqa: E501
         )
 
-    result_keys = list(results[0])
-    data_list = [result_keys] + [list(result.values()) for result in results]
+    # rows are written while they are fetched, they are only kept in memory
+    # when they have to be written to both the file and the stream
+    data_list = chain(
+        [list(first_result), list(first_result.values())],
+        (list(result.values()) for result in results),
+    )
+    if file_path and stream:
+        data_list = list(data_list)
     data = ""
 
     if file_path:
@@ -949,24 +1048,22 @@ def csv_query(
     return mgp.Record(file_path=file_path, data=data)
 
 
-def write_graphml_header(output: io.StringIO):
-    output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-    output.write(
+def write_graphml_header(output: List[str]):
+    output.append('<?xml version="1.0" encoding="UTF-8"?>\n')
+    output.append(
         '<graphml xmlns="http://graphml.graphdrawing.org/xmlns" xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" xsi:schemaLocation="http://graphml.graphdrawing.org/xmlns http://graphml.graphdrawing.org/xmlns/1.0/graphml.xsd">\n'  # noqa: E501
     )
 
 
 def translate_types(variable: Any):
+    graphml_type = GRAPHML_TYPES.get(type(variable))
+    if graphml_type is not None:
+        return graphml_type
     if isinstance(variable, tuple):
         return get_value_string(variable)
-    if isinstance(variable, str):
-        return "string"
-    if isinstance(variable, bool):
-        return "boolean"
-    if isinstance(variable, float):
-        return "float"
-    if isinstance(variable, int):
-        return "int"
+    for python_type, graphml_type in GRAPHML_TYPES.items():
+        if isinstance(variable, python_type):
+            return graphml_type
     raise Exception(
         "Property values can only be primitive types or arrays of primitive types."  # noqa: E501
     )
@@ -984,7 +1081,7 @@ def check_if_elements_same_type(variable: List[Any]):
 
 
 def get_type_string(variable: Any) -> Union[str, List[Any]]:
-    if not isinstance(variable, tuple):
+    if type(variable) is not tuple:
         return translate_types(variable), False
     if len(variable) == 0:
         return "string", True
@@ -992,87 +1089,68 @@ def get_type_string(variable: Any) -> Union[str, List[Any]]:
     return translate_types(variable[0]), True
 
 
-def write_key_graphml(
-    output: io.StringIO,
+def get_key_id_graphml(
+    keys: Dict[KeyObjectGraphML, str],
     working_key: KeyObjectGraphML,
-    key_id_counter: int,
-    config: mgp.Map,
-):
-    output.write(
-        f'<key id="d{key_id_counter}" for="{working_key.is_for}" attr.name="{working_key.name}"'  # noqa: E501
+    keys_output: List[str],
+    key_templates: Tuple[str, str],
+) -> str:
+    """
+    Returns the id of the given key, declaring the key first if it hasn't been
+    seen before. key_templates holds the scalar and the list key declaration.
+    """
+    key_id = keys.get(working_key)
+    if key_id is not None:
+        return key_id
+
+    key_id = f"d{len(keys)}"
+    working_key.id = key_id
+    keys[working_key] = key_id
+    keys_output.append(
+        key_templates[working_key.type_is_list].format(
+            id=key_id,
+            is_for=working_key.is_for,
+            name=escape(working_key.name, XML_ATTRIBUTE_ENTITIES),
+            type=working_key.type,
+        )
     )
-    if config.get("useTypes"):
-        if working_key.type_is_list:
-            output.write(f' attr.type="string" attr.list="{working_key.type}"')
-        else:
-            output.write(f' attr.type="{working_key.type}"')
-    output.write("/>\n")
-    working_key.id = "d" + str(key_id_counter)
+    return key_id
 
 
-def get_gephi_label_value(element: Union[Node, Relationship], config: mgp.Map) -> str:
-    for caption in config.get("caption"):
-        if caption in element.get("properties").keys():
-            return str(element.get("properties").get(caption))
+def get_gephi_label_value(
+    element: Union[Node, Relationship], captions: List[str]
+) -> str:
+    properties = element.get("properties")
+    for caption in captions:
+        if caption in properties:
+            return str(properties[caption])
 
-    if element.get("properties").values():
-        return str(list(element.get("properties").values())[0])
+    if properties:
+        return str(next(iter(properties.values())))
 
     return str(element.get("id"))
 
 
-def get_data_key(
-    keys: set, name: str, is_for: str, type: str = "", is_list: bool = False
-) -> str:
-    for key in keys:
-        if (
-            key.name == name
-            and key.is_for == is_for
-            and key.type == type
-            and key.type_is_list == is_list
-        ):
-            return key.id
-
-
 def write_labels_as_data(
     element: Union[Node, Relationship],
-    output: io.StringIO,
-    config: mgp.Map,
-    keys: set,
+    output: List[str],
+    graphml_format: str,
+    captions: List[str],
+    labels_string: str,
+    labels_key_id: str,
+    type_key_id: str,
 ):
-    if not element.get("labels"):
-        return
-
-    if config.get("format").upper() == "GEPHI":
-        output.write(
-            f'<data key="{get_data_key(keys, "TYPE", "node", translate_types("TYPE"))}">'  # noqa: E501
-        )
-        for label in element.get("labels"):
-            output.write(f":{label}")
-        output.write("</data>")
-        output.write(
-            f'<data key="{get_data_key(keys, "labels", "node", translate_types("labels"))}">{get_gephi_label_value(element, config)}</data>'  # noqa: E501 SHOULD IT BE LABEL?
+    if graphml_format == "GEPHI":
+        output.append(
+            f'<data key="{type_key_id}">:{labels_string}</data><data key="{labels_key_id}">{escape(get_gephi_label_value(element, captions))}</data>'  # noqa: E501 SHOULD IT BE LABEL?
         )
         return
 
-    if config.get("format").upper() == "TINKERPOP":
-        output.write(
-            f'<data key="{get_data_key(keys, "labelV", "node", translate_types("labelV"))}">'  # noqa: E501
-        )
-        for index, value in enumerate(element.get("labels")):
-            if index == 0:
-                output.write(value)
-            else:
-                output.write(f":{value}")
-        output.write("</data>")
+    if graphml_format == "TINKERPOP":
+        output.append(f'<data key="{labels_key_id}">{labels_string}</data>')
         return
 
-    output.write(
-        f'<data key="{get_data_key(keys, "labels", "node", translate_types("labels"))}">'  # noqa: E501
-    )
-    for label in element.get("labels"):
-        output.write(f":{label}")
-    output.write("</data>")
+    output.append(f'<data key="{labels_key_id}">:{labels_string}</data>')
 
 
 def get_value_string(value: Any) -> str:
@@ -1083,32 +1161,44 @@ def get_value_string(value: Any) -> str:
 
 def process_graph_element_graphml(  # noqa: C901
     graph: List[Union[Node, Relationship]],
-    keys_output: io.StringIO,
-    nodes_and_rels_output: io.StringIO,
+    keys_output: List[str],
+    nodes_and_rels_output: List[str],
     config: mgp.Map,
-) -> set:
-    keys = set()
-    key_id_counter = 0
+) -> Dict[KeyObjectGraphML, str]:
+    keys = dict()
+
+    graphml_format = config.get("format")
+    is_gephi = graphml_format == "GEPHI"
+    is_tinkerpop = graphml_format == "TINKERPOP"
+    captions = config.get("caption")
+    key_templates = (
+        (GRAPHML_TYPED_KEY_TEMPLATE, GRAPHML_TYPED_LIST_KEY_TEMPLATE)
+        if config.get("useTypes")
+        else (GRAPHML_KEY_TEMPLATE, GRAPHML_KEY_TEMPLATE)
+    )
 
     for element in graph:
-        working_key = None
         if element.get("type") == "node":
-            nodes_and_rels_output.write(f'<node id="n{str(element.get("id"))}')
-            if element.get("labels") and config.get("format").upper() != "TINKERPOP":
-                nodes_and_rels_output.write('" labels="')
-                for label in element.get("labels"):
-                    nodes_and_rels_output.write(f":{label}")
-            nodes_and_rels_output.write('">')
-
-            if config.get("format").upper() == "GEPHI":
-                working_key = KeyObjectGraphML("TYPE", "node", translate_types("TYPE"))
-                keys.add(working_key)
-                if len(keys) == key_id_counter + 1:
-                    write_key_graphml(keys_output, working_key, key_id_counter, config)
-                    key_id_counter = key_id_counter + 1
-
-            if element.get("labels"):
-                if config.get("format").upper() == "TINKERPOP":
+            labels = element.get("labels")
+            labels_string = escape(":".join(labels), XML_ATTRIBUTE_ENTITIES)
+            if labels and not is_tinkerpop:
+                nodes_and_rels_output.append(
+                    f'<node id="n{str(element.get("id"))}" labels=":{labels_string}">'
+                )
+            else:
+                nodes_and_rels_output.append(f'<node id="n{str(element.get("id"))}">')
+
+            type_key_id = None
+            if is_gephi:
+                type_key_id = get_key_id_graphml(
+                    keys,
+                    KeyObjectGraphML("TYPE", "node", translate_types("TYPE")),
+                    keys_output,
+                    key_templates,
+                )
+
+            if labels:
+                if is_tinkerpop:
                     working_key = KeyObjectGraphML(
                         "labelV", "node", translate_types("labelV")
                     )
@@ -1116,45 +1206,51 @@ def process_graph_element_graphml(  # noqa: C901
                     working_key = KeyObjectGraphML(
                         "labels", "node", translate_types("labels")
                     )
-                keys.add(working_key)
-                if len(keys) == key_id_counter + 1:
-                    write_key_graphml(keys_output, working_key, key_id_counter, config)
-                    key_id_counter = key_id_counter + 1
+                labels_key_id = get_key_id_graphml(
+                    keys, working_key, keys_output, key_templates
+                )
 
-            write_labels_as_data(element, nodes_and_rels_output, config, keys)
+                write_labels_as_data(
+                    element,
+                    nodes_and_rels_output,
+                    graphml_format,
+                    captions,
+                    labels_string,
+                    labels_key_id,
+                    type_key_id,
+                )
 
             for name, value in element.get("properties").items():
                 type_string, is_list = get_type_string(value)
-                working_key = KeyObjectGraphML(name, "node", type_string, is_list)
-                keys.add(working_key)
-                if len(keys) == key_id_counter + 1:
-                    write_key_graphml(keys_output, working_key, key_id_counter, config)
-                    key_id_counter = key_id_counter + 1
-                else:
-                    working_key.id = get_data_key(
-                        keys, name, "node", type_string, is_list
-                    )
+                key_id = get_key_id_graphml(
+                    keys,
+                    KeyObjectGraphML(name, "node", type_string, is_list),
+                    keys_output,
+                    key_templates,
+                )
 
-                nodes_and_rels_output.write(
-                    f'<data key="{working_key.id}">{get_value_string(value)}</data>'  # noqa: E501
+                nodes_and_rels_output.append(
+                    f'<data key="{key_id}">{escape(get_value_string(value))}</data>'
                 )
-            nodes_and_rels_output.write("</node>\n")
+            nodes_and_rels_output.append("</node>\n")
 
         elif element.get("type") == "relationship":
-            nodes_and_rels_output.write(
-                f'<edge id="e{str(element.get("id"))}" source="n{str(element.get("start"))}" target="n{str(element.get("end"))}" label="{element.get("label")}">'  # noqa: E501
+            label = escape(element.get("label"), XML_ATTRIBUTE_ENTITIES)
+            nodes_and_rels_output.append(
+                f'<edge id="e{str(element.get("id"))}" source="n{str(element.get("start"))}" target="n{str(element.get("end"))}" label="{label}">'  # noqa: E501
             )
 
-            if config.get("format").upper() == "GEPHI":
-                working_key = KeyObjectGraphML("TYPE", "edge", translate_types("TYPE"))
-                keys.add(working_key)
-                if len(keys) == key_id_counter + 1:
-                    write_key_graphml(keys_output, working_key, key_id_counter, config)
-                    key_id_counter = key_id_counter + 1
-                nodes_and_rels_output.write(
-                    f'<data key="{get_data_key(keys, "TYPE", "edge", translate_types("TYPE"))}">{element.get("label")}</data>'  # noqa: E501
+            if is_gephi:
+                type_key_id = get_key_id_graphml(
+                    keys,
+                    KeyObjectGraphML("TYPE", "edge", translate_types("TYPE")),
+                    keys_output,
+                    key_templates,
+                )
+                nodes_and_rels_output.append(
+                    f'<data key="{type_key_id}">{label}</data>'
                 )
-            if config.get("format").upper() == "TINKERPOP":
+            if is_tinkerpop:
                 working_key = KeyObjectGraphML(
                     "labelE", "edge", translate_types("labelE")
                 )
@@ -1162,56 +1258,109 @@ def process_graph_element_graphml(  # noqa: C901
                 working_key = KeyObjectGraphML(
                     "label", "edge", translate_types("label")
                 )
-            keys.add(working_key)
-            if len(keys) == key_id_counter + 1:
-                write_key_graphml(keys_output, working_key, key_id_counter, config)
-                key_id_counter = key_id_counter + 1
-            nodes_and_rels_output.write(
-                f'<data key="{get_data_key(keys, working_key.name, "edge", working_key.type)}">{element.get("label")}</data>'  # noqa: E501
+            label_key_id = get_key_id_graphml(
+                keys, working_key, keys_output, key_templates
             )
+            nodes_and_rels_output.append(f'<data key="{label_key_id}">{label}</data>')
 
             for name, value in element.get("properties").items():
                 type_string, is_list = get_type_string(value)
-                working_key = KeyObjectGraphML(name, "edge", type_string, is_list)
-                keys.add(working_key)
-                if len(keys) == key_id_counter + 1:
-                    write_key_graphml(keys_output, working_key, key_id_counter, config)
-                    key_id_counter = key_id_counter + 1
-                else:
-                    working_key.id = get_data_key(
-                        keys, name, "edge", type_string, is_list
-                    )
+                key_id = get_key_id_graphml(
+                    keys,
+                    KeyObjectGraphML(name, "edge", type_string, is_list),
+                    keys_output,
+                    key_templates,
+                )
 
-                nodes_and_rels_output.write(
-                    f'<data key="{working_key.id}">{get_value_string(value)}</data>'  # noqa: E501
+                nodes_and_rels_output.append(
+                    f'<data key="{key_id}">{escape(get_value_string(value))}</data>'
                 )
-            nodes_and_rels_output.write("</edge>\n")
+            nodes_and_rels_output.append("</edge>\n")
 
+    return keys
 
-def write_graphml_graph_id(output: io.StringIO):
-    output.write('<graph id="G" edgedefault="directed">\n')
 
+def write_graphml_graph_id(output: List[str]):
+    output.append('<graph id="G" edgedefault="directed">\n')
 
-def write_graphml_footer(output: io.StringIO):
-    output.write("</graph>\n")
-    output.write("</graphml>")
+
+def write_graphml_footer(output: List[str]):
+    output.append("</graph>\n")
+    output.append("</graphml>")
+
+
+def get_graphml_document(graph: List[Dict[str, Any]], config: mgp.Map) -> List[str]:
+    output = list()
+    keys_output = list()
+    nodes_and_rels_output = list()
+
+    write_graphml_header(output)
+    process_graph_element_graphml(graph, keys_output, nodes_and_rels_output, config)
+    output.extend(keys_output)
+    write_graphml_graph_id(output)
+    output.extend(nodes_and_rels_output)
+    write_graphml_footer(output)
+
+    return output
+
+
+def write_graphml_file(path: str, document: List[str]) -> None:
+    try:
+        with open(path, "w", buffering=FILE_BUFFER_SIZE, encoding="utf8") as outfile:
+            outfile.writelines(document)
+    except PermissionError:
+        raise PermissionError(
+            "You don't have permissions to write into that file. Make sure to give the necessary permissions to user memgraph."  # noqa: E501
+        )
+    except Exception:
+        raise OSError("Could not open or write to the file.")
+
+
+def write_graphml_part(
+    path: str, graph: List[Dict[str, Any]], config: Dict[str, Any]
+) -> None:
+    write_graphml_file(path, get_graphml_document(graph, config))
+
+
+def write_graphml_chunks(
+    path: str, graph: List[Dict[str, Any]], config: Dict[str, Any]
+) -> None:
+    """
+    Splits the graph elements into config["chunks"] consecutive parts and
+    writes each part as a standalone graphML document to <path>.part<i>.
+    Parts are serialized and written in separate worker processes, since
+    building the documents is CPU bound and threads would be serialized by the
+    GIL. There are never more parts than elements, so no empty part files are
+    written.
+    """
+    chunks = max(1, min(config.get("chunks"), len(graph)))
+    chunk_size, remainder = divmod(len(graph), chunks)
+
+    parts = list()
+    start = 0
+    for index in range(chunks):
+        end = start + chunk_size + (1 if index < remainder else 0)
+        parts.append((f"{path}.part{index}", graph[start:end]))
+        start = end
+
+    with ProcessPoolExecutor(max_workers=chunks) as executor:
+        futures = [
+            executor.submit(write_graphml_part, part_path, part, config)
+            for part_path, part in parts
+        ]
+        # result() re-raises errors of the workers, such as PermissionError
+        for future in futures:
+            future.result()
 
 
 def set_default_config(config: mgp.Map) -> mgp.Map:
-    if config is None:
-        config = dict()
-    if not config.get("stream"):
-        config.update({"stream": False})
-    if not config.get("format"):
-        config.update({"format": ""})
-    if not config.get("caption"):
-        config.update({"caption": tuple()})
-    if not config.get("useTypes"):
-        config.update({"useTypes": False})
-    if not config.get("leaveOutLabels"):
-        config.update({"leaveOutLabels": False})
-    if not config.get("leaveOutProperties"):
-        config.update({"leaveOutProperties": False})
+    if not config:
+        return dict(GRAPHML_DEFAULT_CONFIG)
+
+    config = {
+        **GRAPHML_DEFAULT_CONFIG,
+        **{key: value for key, value in config.items() if value is not None},
+    }
     if (
         not isinstance(config.get("stream"), bool)
         or not isinstance(config.get("format"), str)
@@ -1219,10 +1368,14 @@ def set_default_config(config: mgp.Map) -> mgp.Map:
         or not isinstance(config.get("useTypes"), bool)
         or not isinstance(config.get("leaveOutLabels"), bool)
         or not isinstance(config.get("leaveOutProperties"), bool)
+        or isinstance(config.get("chunks"), bool)
+        or not isinstance(config.get("chunks"), int)
+        or config.get("chunks") < 1
     ):
         raise TypeError(
             "Config parameter must be a map with specific keys and values described in documentation."  # noqa: E501
         )
+    config["format"] = config["format"].upper()
     return config
 
 
@@ -1240,6 +1393,15 @@ def graphml(
     path : str
         Path to the graphML file containing the exported graph database.
     config : Map
+        chunks (int) = 1: If greater than 1, no file is written to path.
+        Instead, the elements are split into that many standalone graphML
+        files <path>.part0, <path>.part1, ..., written in parallel, but never
+        into more parts than there are elements. Parts hold consecutive
+        elements with all nodes before all relationships, so a relationship
+        can be in a different part than its start and end nodes. Each part
+        declares only the keys it uses. Import the parts in order and, for
+        relationships whose nodes are in other parts, set source and target
+        in the import_util.graphml config.
 
     """
 
@@ -1253,30 +1415,16 @@ def graphml(
     if not path and not config.get("stream"):
         raise Exception("Please provide file name or set stream to True in config.")
 
-    output = io.StringIO()
-    keys_output = io.StringIO()
-    nodes_and_rels_output = io.StringIO()
-
-    write_graphml_header(output)
-    process_graph_element_graphml(graph, keys_output, nodes_and_rels_output, config)
-    output.write(keys_output.getvalue())
-    write_graphml_graph_id(output)
-    output.write(nodes_and_rels_output.getvalue())
-    write_graphml_footer(output)
-
-    try:
-        if path:
-            with open(path, "w") as outfile:
-                outfile.write(output.getvalue())
-            outfile.close()
-    except PermissionError:
-        raise PermissionError(
-            "You don't have permissions to write into that file. Make sure to give the necessary permissions to user memgraph."  # noqa: E501
-        )
-    except Exception:
-        raise OSError("Could not open or write to the file.")
+    document = None
+    if path and config.get("chunks") > 1:
+        write_graphml_chunks(path, graph, config)
+    elif path:
+        document = get_graphml_document(graph, config)
+        write_graphml_file(path, document)
 
     if config.get("stream"):
-        return mgp.Record(status=output.getvalue())
+        if document is None:
+            document = get_graphml_document(graph, config)
+        return mgp.Record(status="".join(document))
 
     return mgp.Record(status="success")
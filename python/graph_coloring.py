@@ -6,6 +6,8 @@ from mage.graph_coloring_module import Parameter
 from mage.graph_coloring_module import Graph
 from mage.graph_coloring_module import IncorrectParametersException
 
+ABORT_CHECK_INTERVAL = 4096
+
 
 @mgp.read_proc
 def color_graph(
@@ -146,17 +148,19 @@ def _get_parameters(parameters: Dict[str, Any]) -> Dict[str, Any]:
 def _convert_to_graph(context: mgp.ProcCtx, edge_property: str) -> Graph:
     nodes = []
     adj_list = defaultdict(list)
-
-    for v in context.graph.vertices:
-        context.check_must_abort()
-        nodes.append(v.id)
-
-    for v in context.graph.vertices:
-        context.check_must_abort()
+    neighbors_of = adj_list.__getitem__
+
+    for i, v in enumerate(context.graph.vertices):
+        if i % ABORT_CHECK_INTERVAL == 0:
+            context.check_must_abort()
+        v_id = v.id
+        nodes.append(v_id)
+        v_neighbors = neighbors_of(v_id)
         for e in v.out_edges:
             weight = e.properties.get(edge_property, 1)
-            adj_list[e.from_vertex.id].append((e.to_vertex.id, weight))
-            adj_list[e.to_vertex.id].append((e.from_vertex.id, weight))
+            to_id = e.to_vertex.id
+            v_neighbors.append((to_id, weight))
+            neighbors_of(to_id).append((v_id, weight))
 
     return Graph(nodes, adj_list)
 
@@ -170,20 +174,28 @@ def _convert_to_subgraph(
     vertices, edges = map(set, [vertices, edges])
 
     nodes = []
+    nodes_set = set()
     adj_list = defaultdict(list)
 
-    for v in vertices:
-        context.check_must_abort()
+    for i, v in enumerate(vertices):
+        if i % ABORT_CHECK_INTERVAL == 0:
+            context.check_must_abort()
         nodes.append(v.id)
+        nodes_set.add(v.id)
 
-    for e in edges:
-        context.check_must_abort()
+    for i, e in enumerate(edges):
+        if i % ABORT_CHECK_INTERVAL == 0:
+            context.check_must_abort()
         weight = e.properties.get(edge_property, 1)
-        if e.from_vertex.id not in nodes:
-            nodes.append(e.from_vertex.id)
-        if e.to_vertex.id not in nodes:
-            nodes.append(e.to_vertex.id)
-        adj_list[e.from_vertex.id].append((e.to_vertex.id, weight))
-        adj_list[e.to_vertex.id].append((e.from_vertex.id, weight))
+        from_id = e.from_vertex.id
+        to_id = e.to_vertex.id
+        if from_id not in nodes_set:
+            nodes.append(from_id)
+            nodes_set.add(from_id)
+        if to_id not in nodes_set:
+            nodes.append(to_id)
+            nodes_set.add(to_id)
+        adj_list[from_id].append((to_id, weight))
+        adj_list[to_id].append((from_id, weight))
 
     return Graph(nodes, adj_list)
@@ -1,5 +1,4 @@
-from collections import defaultdict
-from typing import Dict, List
+from typing import List
 
 import mgp
 
@@ -101,12 +100,12 @@ def topological_sort(
         raise InvalidTopologicalSortingModeException(
             'Mode can only be either "out" or "in"'
         )
-    if contains_cycle(ctx):
+    graph = MemgraphIgraph(ctx=ctx, directed=True)
+    if not graph.is_dag():
         raise TopologicalSortException(
             "Topological sort can't be performed on graph that contains cycle!"
         )
 
-    graph = MemgraphIgraph(ctx=ctx, directed=True)
     sorted_nodes = graph.topological_sort(mode=mode)
 
     return mgp.Record(
@@ -189,15 +188,16 @@ def all_shortest_path_lengths(
 ) -> mgp.Record(src_node=mgp.Vertex, dest_node=mgp.Vertex, length=float):
     graph = MemgraphIgraph(ctx, directed=directed)
     lengths = graph.all_shortest_path_lengths(weights=weights)
+    vertices = [graph.get_vertex_by_id(i) for i in range(len(lengths))]
 
     return [
         mgp.Record(
-            src_node=graph.get_vertex_by_id(i),
-            dest_node=graph.get_vertex_by_id(j),
-            length=float(lengths[i][j]),
+            src_node=src_node,
+            dest_node=dest_node,
+            length=float(length),
         )
-        for i in range(len(lengths))
-        for j in range(len(lengths[i]))
+        for src_node, row in zip(vertices, lengths)
+        for dest_node, length in zip(vertices, row)
     ]
 
 
@@ -214,48 +214,3 @@ def get_shortest_path(
     return mgp.Record(
         path=graph.get_shortest_path(source=source, target=target, weights=weights)
     )
-
-
-def dfs(node: mgp.Vertex, visited: Dict[int, bool], stack: Dict[int, bool]) -> bool:
-    """Depth-first-search algorithm with modification.
-
-    Args:
-        node (mgp.Vertex): Current node.
-        visited (Dict[int,bool]): Dictionary with all nodes id that we visited.
-        stack (Dict[int,bool]): Dictionary with nodes id that we encountered while traversing a node.
-
-    Returns:
-        bool: True if there is cycle else False.
-    """
-
-    visited[node.id] = True
-    stack[node.id] = True
-
-    for edge in node.out_edges:
-        neighbour = edge.to_vertex
-        if not visited[neighbour.id]:
-            if dfs(neighbour, visited, stack):
-                return True
-        elif stack[neighbour.id]:
-            return True
-
-    stack[node.id] = False
-    return False
-
-
-def contains_cycle(ctx: mgp.ProcCtx) -> bool:
-    """Method for checking if graph contains a cycle.
-
-    Args:
-        ctx (mgp.ProcCtx): Graph
-
-    Returns:
-        bool: True if there is cycle else False
-    """
-
-    visited, stack = defaultdict(bool), defaultdict(bool)
-    for node in ctx.graph.vertices:
-        if not visited[node.id]:
-            if dfs(node, visited, stack):
-                return True
-    return False
@@ -14,6 +14,7 @@ from mage.link_prediction import (
     classify,
     inner_train,
     inner_predict,
+    float32_matmul_precision,
     create_model,
     create_optimizer,
     create_predictor,
@@ -318,30 +319,31 @@ def train(
         act_func=link_prediction_parameters.last_activation_function
     )
 
-    # Call training method
-    training_results, validation_results = inner_train(
-        graph,
-        train_eid_dict,
-        val_eid_dict,
-        link_prediction_parameters.target_relation,
-        model,
-        predictor,
-        optimizer,
-        link_prediction_parameters.num_epochs,
-        m,
-        threshold,
-        link_prediction_parameters.node_features_property,
-        link_prediction_parameters.console_log_freq,
-        link_prediction_parameters.checkpoint_freq,
-        link_prediction_parameters.metrics,
-        link_prediction_parameters.tr_acc_patience,
-        link_prediction_parameters.context_save_dir,
-        link_prediction_parameters.num_neg_per_pos_edge,
-        num_layers,
-        link_prediction_parameters.batch_size,
-        link_prediction_parameters.sampling_workers,
-        device,
-    )
+    # Call training method, allowing TF32 matmuls in the GNN layers
+    with float32_matmul_precision("high"):
+        training_results, validation_results = inner_train(
+            graph,
+            train_eid_dict,
+            val_eid_dict,
+            link_prediction_parameters.target_relation,
+            model,
+            predictor,
+            optimizer,
+            link_prediction_parameters.num_epochs,
+            m,
+            threshold,
+            link_prediction_parameters.node_features_property,
+            link_prediction_parameters.console_log_freq,
+            link_prediction_parameters.checkpoint_freq,
+            link_prediction_parameters.metrics,
+            link_prediction_parameters.tr_acc_patience,
+            link_prediction_parameters.context_save_dir,
+            link_prediction_parameters.num_neg_per_pos_edge,
+            num_layers,
+            link_prediction_parameters.batch_size,
+            link_prediction_parameters.sampling_workers,
+            device,
+        )
 
     # Return results
     return mgp.Record(
@@ -678,9 +680,10 @@ def load_model(
         status(mgp.Any): True just to indicate that loading went well.
     """
 
-    global model, predictor
-    model = torch.load(path + Context.MODEL_NAME)
-    predictor = torch.load(path + Context.PREDICTOR_NAME)
+    global model, predictor, device
+    # Periodic checkpoints are written from the CPU, so the model is moved to the device it is used on
+    model = torch.load(path + Context.MODEL_NAME, map_location=device)
+    predictor = torch.load(path + Context.PREDICTOR_NAME, map_location=device)
     return mgp.Record(status=True)
 
 
@@ -1297,7 +1300,4 @@ def get_number_of_edges(ctx: mgp.ProcCtx) -> int:
     Returns:
         int: A number of edges.
     """
-    edge_cnt = 0
-    for vertex in ctx.graph.vertices:
-        edge_cnt += len(list(vertex.out_edges))
-    return edge_cnt
+    return sum(1 for vertex in ctx.graph.vertices for _ in vertex.out_edges)
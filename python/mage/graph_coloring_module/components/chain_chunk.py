@@ -43,11 +43,10 @@ class ChainChunkFactory:
     ) -> List[List[Individual]]:
         """Splits a list into equal parts."""
         k, m = divmod(population_size, no_of_chunks)
-        chunks = [
-            list(individuals[i * k + min(i, m) : (i + 1) * k + min(i + 1, m)])
-            for i in range(no_of_chunks)
-        ]
-        return chunks
+        bounds = [0]
+        for i in range(no_of_chunks):
+            bounds.append(bounds[-1] + k + (1 if i < m else 0))
+        return [individuals[bounds[i] : bounds[i + 1]] for i in range(no_of_chunks)]
 
 
 class ChainChunk(CorrelationPopulation):
@@ -1,5 +1,4 @@
 from typing import Tuple, List, Any, Dict, Iterator
-from itertools import islice
 
 
 class Graph:
@@ -22,21 +21,20 @@ class Graph:
             (label, index) for index, label in enumerate(nodes)
         )
         self._nodes_count = len(nodes)
-        self._neighbors_positions = []
+        # CSR layout: the neighbors of node i are stored in
+        # self._neighbors[self._neighbors_positions[i]:self._neighbors_positions[i + 1]]
+        self._neighbors_positions = [0]
         self._neighbors = []
         self._weights = []
         self._name = name
 
-        for i in range(self._nodes_count):
+        labels_to_indices = self._labels_to_indices
+        for label in nodes:
+            weighted_neighbors = adjacency_list[label]
             self._neighbors.extend(
-                [
-                    self._labels_to_indices[node[0]]
-                    for node in adjacency_list[self._indices_to_labels[i]]
-                ]
-            )
-            self._weights.extend(
-                [node[1] for node in adjacency_list[self._indices_to_labels[i]]]
+                labels_to_indices[neighbor] for neighbor, _ in weighted_neighbors
             )
+            self._weights.extend(weight for _, weight in weighted_neighbors)
             self._neighbors_positions.append(len(self._neighbors))
 
     def __str__(self):
@@ -50,9 +48,9 @@ class Graph:
 
     def __getitem__(self, node: int) -> Iterator[int]:
         """Returns an iterator over neighbors of the given node."""
-        start = self._neighbors_positions[node - 1] if node != 0 else 0
-        end = self._neighbors_positions[node]
-        return islice(self._neighbors, start, end)
+        start = self._neighbors_positions[node]
+        end = self._neighbors_positions[node + 1]
+        return iter(self._neighbors[start:end])
 
     @property
     def nodes(self) -> Iterator[int]:
@@ -74,8 +72,8 @@ class Graph:
 
     def weighted_neighbors(self, node: int) -> Iterator[Tuple[int, float]]:
         """Returns an iterator over neighbor and weight tuples of the node."""
-        start = self._neighbors_positions[node - 1] if node != 0 else 0
-        end = self._neighbors_positions[node]
+        start = self._neighbors_positions[node]
+        end = self._neighbors_positions[node + 1]
         return self._neighbor_weight_tuples(start, end)
 
     def weight(self, node_1: int, node_2: int) -> float:
@@ -88,8 +86,8 @@ class Graph:
 
     def degree(self, node: int) -> int:
         """Returns the degree of the given node."""
-        start = self._neighbors_positions[node - 1] if node != 0 else 0
-        end = self._neighbors_positions[node]
+        start = self._neighbors_positions[node]
+        end = self._neighbors_positions[node + 1]
         return start - end
 
     def label(self, node: int) -> Any:
@@ -99,7 +97,4 @@ class Graph:
     def _neighbor_weight_tuples(
         self, start: int, end: int
     ) -> Iterator[Tuple[int, Any]]:
-        return zip(
-            (self._neighbors[i] for i in range(start, end)),
-            (self._weights[i] for i in range(start, end)),
-        )
+        return zip(self._neighbors[start:end], self._weights[start:end])
@@ -5,6 +5,7 @@ from mage.link_prediction.link_prediction_util import (  # noqa: F401
     inner_train,
     preprocess,
     inner_predict,
+    float32_matmul_precision,
 )
 
 
@@ -1,7 +1,10 @@
+import copy
+import itertools
+import pickle
 import torch
 import numpy as np
 import dgl
-from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from sklearn.metrics import (
     roc_auc_score,
     accuracy_score,
@@ -10,11 +13,13 @@ from sklearn.metrics import (
     f1_score,
     confusion_matrix,
 )
-from typing import Callable, Dict, Tuple, List
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Tuple, List, Union
 import random
 from mage.link_prediction.constants import (
     Metrics,
     Context,
+    Devices,
 )
 
 # Function for obtaining reverse_relation naming given original relation
@@ -150,132 +155,109 @@ def evaluate(
     metrics: List[str],
     labels: torch.tensor,
     probs: torch.tensor,
-    result: Dict[str, float],
     threshold: float,
     epoch: int,
     loss: float,
-    operator: Callable[[float, float], float],
-) -> None:
-    """Returns all metrics specified in metrics list based on labels and predicted classes. In-place modification of dictionary.
+) -> Dict[str, Union[int, float]]:
+    """Returns all metrics specified in metrics list based on labels and predicted classes. Metrics are computed once over
+    all examples seen in the epoch, so example counts are epoch totals. Counts are returned as Python ints and scores as
+    Python floats so they can be returned to Memgraph.
 
     Args:
         metrics (List[str]): List of string metrics.
-        labels (torch.tensor): Predefined labels.
-        probs (torch.tensor): Probabilities of src_nodes = blocks[0].srcdata[dgl.NID]
-    dst_nodes = blocks[0].dstdata[dgl.NID]
+        labels (torch.tensor): Predefined labels of all edges in the epoch.
+        probs (torch.tensor): Probabilities of all edges in the epoch.
+        threshold (float): Classification threshold.
+        epoch (int): Current epoch.
+        loss (float): Average loss over the epoch batches.
     Returns:
-        Dict[str, float]: Metrics embedded in dictionary -> name-value shape
+        Dict[str, Union[int, float]]: Metrics embedded in dictionary -> name-value shape
     """
     labels = labels.detach().cpu()
     probs = probs.detach().cpu()
     classes = classify(probs, threshold)
-    result[Metrics.EPOCH] = epoch
-    result[Metrics.LOSS] = operator(result[Metrics.LOSS], loss)
+    result = {Metrics.EPOCH: epoch, Metrics.LOSS: loss}
     tn, fp, fn, tp = confusion_matrix(labels, classes).ravel()
+    # Derive example counts from the confusion matrix instead of new passes over the tensors
+    pos_pred, neg_pred = int(tp + fp), int(tn + fn)
+    pos_examples, neg_examples = int(tp + fn), int(tn + fp)
     for metric_name in metrics:
         if metric_name == Metrics.ACCURACY:
-            result[Metrics.ACCURACY] = operator(
-                result[Metrics.ACCURACY], accuracy_score(labels, classes)
-            )
+            result[Metrics.ACCURACY] = float(accuracy_score(labels, classes))
         elif metric_name == Metrics.AUC_SCORE:
-            result[Metrics.AUC_SCORE] = operator(
-                result[Metrics.AUC_SCORE], roc_auc_score(labels, probs.detach())
-            )
+            result[Metrics.AUC_SCORE] = float(roc_auc_score(labels, probs))
         elif metric_name == Metrics.F1:
-            result[Metrics.F1] = operator(result[Metrics.F1], f1_score(labels, classes))
+            result[Metrics.F1] = float(f1_score(labels, classes))
         elif metric_name == Metrics.PRECISION:
-            result[Metrics.PRECISION] = operator(
-                result[Metrics.PRECISION], precision_score(labels, classes)
-            )
+            result[Metrics.PRECISION] = float(precision_score(labels, classes))
         elif metric_name == Metrics.RECALL:
-            result[Metrics.RECALL] = operator(
-                result[Metrics.RECALL], recall_score(labels, classes)
-            )
+            result[Metrics.RECALL] = float(recall_score(labels, classes))
         elif metric_name == Metrics.POS_PRED_EXAMPLES:
-            result[Metrics.POS_PRED_EXAMPLES] = operator(
-                result[Metrics.POS_PRED_EXAMPLES], classes.sum().item()
-            )
+            result[Metrics.POS_PRED_EXAMPLES] = pos_pred
         elif metric_name == Metrics.NEG_PRED_EXAMPLES:
-            result[Metrics.NEG_PRED_EXAMPLES] = operator(
-                result[Metrics.NEG_PRED_EXAMPLES], classes.sum().item()
-            )
+            result[Metrics.NEG_PRED_EXAMPLES] = neg_pred
         elif metric_name == Metrics.POS_EXAMPLES:
-            result[Metrics.POS_EXAMPLES] = operator(
-                result[Metrics.POS_EXAMPLES], (labels == 1).sum().item()
-            )
+            result[Metrics.POS_EXAMPLES] = pos_examples
         elif metric_name == Metrics.NEG_EXAMPLES:
-            result[Metrics.NEG_EXAMPLES] = operator(
-                result[Metrics.NEG_EXAMPLES], (labels == 0).sum().item()
-            )
+            result[Metrics.NEG_EXAMPLES] = neg_examples
         elif metric_name == Metrics.TRUE_POSITIVES:
-            result[Metrics.TRUE_POSITIVES] = operator(
-                result[Metrics.TRUE_POSITIVES], tp
-            )
+            result[Metrics.TRUE_POSITIVES] = int(tp)
         elif metric_name == Metrics.FALSE_POSITIVES:
-            result[Metrics.FALSE_POSITIVES] = operator(
-                result[Metrics.FALSE_POSITIVES], fp
-            )
+            result[Metrics.FALSE_POSITIVES] = int(fp)
         elif metric_name == Metrics.TRUE_NEGATIVES:
-            result[Metrics.TRUE_NEGATIVES] = operator(
-                result[Metrics.TRUE_NEGATIVES], tn
-            )
+            result[Metrics.TRUE_NEGATIVES] = int(tn)
         elif metric_name == Metrics.FALSE_NEGATIVES:
-            result[Metrics.FALSE_NEGATIVES] = operator(
-                result[Metrics.FALSE_NEGATIVES], fn
-            )
+            result[Metrics.FALSE_NEGATIVES] = int(fn)
+
+    return result
 
 
 def batch_forward_pass(
     model: torch.nn.Module,
     predictor: torch.nn.Module,
     loss: torch.nn.Module,
-    m: torch.nn.Module,
     target_relation: str,
     input_features: Dict[str, torch.Tensor],
     pos_graph: dgl.graph,
     neg_graph: dgl.graph,
     blocks: List[dgl.graph],
     num_neg_per_pos_edge: int,
-    device: torch.device,
+    labels_template: torch.Tensor,
 ) -> Tuple[torch.Tensor, torch.Tensor, torch.nn.Module]:
     """Performs one forward batch pass
 
     Args:
         model (torch.nn.Module): A reference to the model that needs to be trained.
         predictor (torch.nn.Module): A reference to the edge predictor.
-        loss (torch.nn.Module): Loss function.
-        m (torch.nn.Module): The activation function.
+        loss (torch.nn.Module): Loss function. It is computed on raw scores, so it needs to apply the activation itself.
         target_relation: str -> Unique edge type that is used for training.
         input_features (Dict[str, torch.Tensor]): A reference to the input_features that are needed to compute representations for second block.
         pos_graph (dgl.graph): A reference to the positive graph. All edges that should be included.
         neg_graph (dgl.graph): A reference to the negative graph. All edges that shouldn't be included.
         blocks (List[dgl.graph]): First DGLBlock(MFG) is equivalent to all necessary nodes that are needed to compute final representation.
             Second DGLBlock(MFG) is a mini-batch.
-        device (torch.device): Device where the graph is saved.
+        num_neg_per_pos_edge (int): Number of negative edges sampled per one positive edge in the mini-batch.
+        labels_template (torch.Tensor): batch_size ones followed by batch_size * num_neg_per_pos_edge zeros, on the device where the graph is saved.
 
     Returns:
-         Tuple[torch.Tensor, torch.Tensor, torch.nn.Module]: First tensor are calculated probabilities, second tensor are true labels and the last tensor
+         Tuple[torch.Tensor, torch.Tensor, torch.nn.Module]: First tensor are calculated scores, second tensor are true labels and the last tensor
             is a reference to the loss.
     """
     outputs = model.forward(blocks, input_features)
-    # Deal with edge scores
-    pos_score = predictor.forward(pos_graph, outputs, target_relation=target_relation)
-    neg_score = predictor.forward(neg_graph, outputs, target_relation=target_relation)
-    scores = torch.cat(
-        [pos_score, neg_score]
-    )  # concatenated positive and negative score
-    # probabilities
-    probs = m(scores)
-    labels = torch.cat(
-        [
-            torch.ones(pos_score.shape[0], device=device),
-            torch.zeros(neg_score.shape[0], device=device),
-        ]
-    )  # concatenation of labels
+    # Deal with edge scores, concatenated positive and negative score
+    scores, num_pos_edges = predictor.forward_pos_neg(
+        pos_graph, neg_graph, outputs, target_relation=target_relation
+    )
+    num_neg_edges = scores.shape[0] - num_pos_edges
+    # concatenation of labels, sliced around the boundary between ones and zeros of the template
+    num_pos_labels = labels_template.shape[0] // (num_neg_per_pos_edge + 1)
+    labels = labels_template[
+        num_pos_labels - num_pos_edges : num_pos_labels + num_neg_edges
+    ]
     # weights = torch.cat([torch.ones(pos_score.shape[0], dtype=torch.float32), torch.Tensor([1.0 / num_neg_per_pos_edge for _ in range(neg_score.shape[0])])])
-    loss_output = loss(probs, labels)
+    loss_output = loss(scores, labels)
 
-    return probs, labels, loss_output
+    return scores, labels, loss_output
 
 
 def inner_train(
@@ -368,6 +350,9 @@ def inner_train(
     # first MFG, which is identical to all the necessary nodes needed for computing the final representations
     # Feed the list of MFGs and the input node features to the multilayer GNN and get the outputs.
 
+    # The graph and its node features are created directly on the device, so on cuda both sampling and feature gathering
+    # happen on the GPU without per-batch host to device copies. Sampling workers are disabled for cuda in set_model_parameters.
+
     # Define training EdgeDataLoader
     train_dataloader = dgl.dataloading.DataLoader(
         graph,  # The graph
@@ -378,6 +363,8 @@ def inner_train(
         shuffle=True,  # Whether to shuffle the nodes for every epoch
         drop_last=False,  # Whether to drop the last incomplete batch
         num_workers=sampling_workers,  # Number of sampling processes
+        # Keep sampling processes alive between epochs
+        persistent_workers=(sampling_workers > 0),
     )
 
     # Define validation EdgeDataLoader
@@ -390,14 +377,31 @@ def inner_train(
         shuffle=True,  # Whether to shuffle the nodes for every epoch
         drop_last=False,  # Whether to drop the last incomplete batch
         num_workers=sampling_workers,  # Number of sampler processes
+        # Keep sampling processes alive between epochs
+        persistent_workers=(sampling_workers > 0),
+    )
+
+    # Labels of a full batch, partial batches use a slice of it
+    labels_template = torch.cat(
+        [
+            torch.ones(batch_size, device=device),
+            torch.zeros(batch_size * num_neg_per_pos_edge, device=device),
+        ]
     )
 
-    loss = torch.nn.BCELoss()
+    # Sigmoid is fused into the loss, the activation is applied separately only for evaluation
+    loss = torch.nn.BCEWithLogitsLoss()
+
+    # Mixed precision on cuda, gradients are scaled so small float16 values don't underflow
+    use_amp = device.type == Devices.CUDA_DEVICE
+    scaler = torch.cuda.amp.GradScaler(enabled=use_amp)
 
     # Define lambda functions for operating on dictionaries
-    add_: Callable[[float, float], float] = lambda prior, later: prior + later
-    avg_: Callable[[float, float], float] = lambda prior, size: prior / size
     format_float: Callable[[float], float] = lambda prior: round(prior, 3)
+    format_result: Callable[[Dict[str, float]], Dict[str, float]] = lambda result: {
+        key: format_float(val) if key != Metrics.EPOCH else val
+        for key, val in result.items()
+    }
 
     # Training
     max_val_acc, num_val_acc_drop = (
@@ -405,127 +409,141 @@ def inner_train(
         0,
     )  # last maximal accuracy and number of epochs it is dropping
 
-    for epoch in range(1, num_epochs + 1):
-        # Evaluation epoch
-        if epoch % console_log_freq == 0:
-            epoch_training_result = defaultdict(float)
-            epoch_validation_result = defaultdict(float)
-        # Training batch
-        num_batches = 0
-        model.train()
-        tr_finished = False
-        for _, pos_graph, neg_graph, blocks in train_dataloader:
-            input_features = blocks[0].ndata[node_features_property]
-            # Perform forward pass
-            probs, labels, loss_output = batch_forward_pass(
-                model,
-                predictor,
-                loss,
-                m,
-                target_relation,
-                input_features,
-                pos_graph,
-                neg_graph,
-                blocks,
-                num_neg_per_pos_edge,  # TODO: remove
-                device,
-            )
-            # Make an optimization step
-            optimizer.zero_grad()
-            loss_output.backward()  # ***This line generates warning***
-            optimizer.step()
-            # Evaluate on training set
-            if epoch % console_log_freq == 0:
-                evaluate(
-                    metrics,
-                    labels,
-                    probs,
-                    epoch_training_result,
-                    threshold,
-                    epoch,
-                    loss_output.item(),
-                    add_,
-                )
-            # Increment num batches
-            num_batches += 1
-        # Edit train results and evaluate on validation set
-        if epoch % console_log_freq == 0:
-            epoch_training_result = {
-                key: format_float(avg_(val, num_batches))
-                if key != Metrics.EPOCH
-                else val
-                for key, val in epoch_training_result.items()
-            }
-            training_results.append(epoch_training_result)
-            # Check if training finished
-            if (
-                Metrics.ACCURACY in metrics
-                and epoch_training_result[Metrics.ACCURACY] == 1.0
-                and epoch > 1
-            ):
-                tr_finished = True
-            # Evaluate on the validation set
-            model.eval()
-            with torch.no_grad():
-                num_batches = 0
-                for _, pos_graph, neg_graph, blocks in validation_dataloader:
-                    input_features = blocks[0].ndata[node_features_property]
-                    # Perform forward pass
-                    probs, labels, loss_output = batch_forward_pass(
+    # Checkpoint writer and the checkpoint that is currently being written. Leaving the block waits for a pending
+    # checkpoint and stops the writer, also when training raises.
+    with ThreadPoolExecutor(max_workers=1) as checkpoint_saver:
+        checkpoint: Future = None
+
+        for epoch in range(1, num_epochs + 1):
+            # Evaluation epoch
+            evaluation_epoch = epoch % console_log_freq == 0
+            # Probabilities, labels and losses of all batches, evaluated at the end of the epoch. Loss is summed on the device
+            # so it is synchronized with the host only once per epoch.
+            epoch_probs, epoch_labels, epoch_loss = [], [], 0.0
+            # Training batch
+            num_batches = 0
+            model.train()
+            tr_finished = False
+            for _, pos_graph, neg_graph, blocks in train_dataloader:
+                input_features = blocks[0].ndata[node_features_property]
+                # Perform forward pass
+                with torch.autocast(device_type=device.type, enabled=use_amp):
+                    scores, labels, loss_output = batch_forward_pass(
                         model,
                         predictor,
                         loss,
-                        m,
                         target_relation,
                         input_features,
                         pos_graph,
                         neg_graph,
                         blocks,
-                        num_neg_per_pos_edge,  # TODO: remove
-                        device,
+                        num_neg_per_pos_edge,
+                        labels_template,
                     )
-                    # Add to the epoch_validation_result for saving
+                # Make an optimization step
+                optimizer.zero_grad()
+                scaler.scale(
+                    loss_output
+                ).backward()  # ***This line generates warning***
+                scaler.step(optimizer)
+                scaler.update()
+                # Collect outputs for evaluation on training set
+                if evaluation_epoch:
+                    epoch_probs.append(m(scores.detach().float()))
+                    epoch_labels.append(labels)
+                    epoch_loss += loss_output.detach()
+                # Increment num batches
+                num_batches += 1
+            # Evaluate on train and validation set
+            if evaluation_epoch:
+                epoch_training_result = format_result(
                     evaluate(
                         metrics,
-                        labels,
-                        probs,
-                        epoch_validation_result,
+                        torch.cat(epoch_labels),
+                        torch.cat(epoch_probs),
                         threshold,
                         epoch,
-                        loss_output.item(),
-                        add_,
+                        float(epoch_loss) / num_batches,
                     )
-                    num_batches += 1
-            if (
-                num_batches > 0
-            ):  # Because it is possible that user specified not to have a validation dataset
-                # Average over batches
-                epoch_validation_result = {
-                    key: format_float(avg_(val, num_batches))
-                    if key != Metrics.EPOCH
-                    else val
-                    for key, val in epoch_validation_result.items()
-                }
-                validation_results.append(epoch_validation_result)
+                )
+                training_results.append(epoch_training_result)
+                # Check if training finished
                 if (
                     Metrics.ACCURACY in metrics
-                ):  # If user doesn't want to have accuracy information, it cannot be checked for patience.
-                    # Patience check
-                    if epoch_validation_result[Metrics.ACCURACY] <= max_val_acc:
-                        num_val_acc_drop += 1
-                    else:
-                        max_val_acc = epoch_validation_result[Metrics.ACCURACY]
-                        num_val_acc_drop = 0
-                    # Stop the training if necessary
-                    if num_val_acc_drop == tr_acc_patience:
-                        break
-
-        # Save the model if necessary
-        if epoch % checkpoint_freq == 0:
-            _save_context(model, predictor, context_save_dir)
-        # All examples learnt
-        if tr_finished:
-            break
+                    and epoch_training_result[Metrics.ACCURACY] == 1.0
+                    and epoch > 1
+                ):
+                    tr_finished = True
+                # Evaluate on the validation set
+                model.eval()
+                with torch.no_grad():
+                    epoch_probs, epoch_labels, epoch_loss = [], [], 0.0
+                    num_batches = 0
+                    for _, pos_graph, neg_graph, blocks in validation_dataloader:
+                        input_features = blocks[0].ndata[node_features_property]
+                        # Perform forward pass
+                        with torch.autocast(device_type=device.type, enabled=use_amp):
+                            scores, labels, loss_output = batch_forward_pass(
+                                model,
+                                predictor,
+                                loss,
+                                target_relation,
+                                input_features,
+                                pos_graph,
+                                neg_graph,
+                                blocks,
+                                num_neg_per_pos_edge,
+                                labels_template,
+                            )
+                        # Collect outputs for evaluation on validation set
+                        epoch_probs.append(m(scores.float()))
+                        epoch_labels.append(labels)
+                        epoch_loss += loss_output
+                        num_batches += 1
+                if (
+                    num_batches > 0
+                ):  # Because it is possible that user specified not to have a validation dataset
+                    epoch_validation_result = format_result(
+                        evaluate(
+                            metrics,
+                            torch.cat(epoch_labels),
+                            torch.cat(epoch_probs),
+                            threshold,
+                            epoch,
+                            float(epoch_loss) / num_batches,
+                        )
+                    )
+                    validation_results.append(epoch_validation_result)
+                    if (
+                        Metrics.ACCURACY in metrics
+                    ):  # If user doesn't want to have accuracy information, it cannot be checked for patience.
+                        # Patience check
+                        if epoch_validation_result[Metrics.ACCURACY] <= max_val_acc:
+                            num_val_acc_drop += 1
+                        else:
+                            max_val_acc = epoch_validation_result[Metrics.ACCURACY]
+                            num_val_acc_drop = 0
+                        # Stop the training if necessary
+                        if num_val_acc_drop == tr_acc_patience:
+                            break
+
+            # Save the model if necessary, snapshots are written in the background while training continues
+            if epoch % checkpoint_freq == 0:
+                if checkpoint is not None:
+                    checkpoint.result()
+                checkpoint = checkpoint_saver.submit(
+                    _save_context,
+                    _cpu_copy(model),
+                    _cpu_copy(predictor),
+                    context_save_dir,
+                )
+            # All examples learnt
+            if tr_finished:
+                break
+
+        # Wait for the last checkpoint so it doesn't overwrite the final model
+        if checkpoint is not None:
+            checkpoint.result()
 
     # Save model at the end of the training
     _save_context(model, predictor, context_save_dir)
@@ -533,6 +551,44 @@ def inner_train(
     return training_results, validation_results
 
 
+@contextmanager
+def float32_matmul_precision(precision: str) -> Iterator[None]:
+    """Sets the precision of float32 matrix multiplications for the duration of the block. With "high", GEMMs in GNN layers
+    can use TF32 tensor cores on supported GPUs. The previous precision is restored on exit.
+
+    Args:
+        precision (str): One of "highest", "high" or "medium".
+    """
+    previous_precision = torch.get_float32_matmul_precision()
+    torch.set_float32_matmul_precision(precision)
+    try:
+        yield
+    finally:
+        torch.set_float32_matmul_precision(previous_precision)
+
+
+def _cpu_copy(module: torch.nn.Module) -> torch.nn.Module:
+    """Copies the module for a checkpoint. Parameters and buffers are copied straight to the host memory, so the snapshot
+    takes no additional device memory and doesn't change while the training continues.
+
+    Args:
+        module (torch.nn.Module): A reference to the module.
+
+    Returns:
+        torch.nn.Module: Copy of the module on the CPU.
+    """
+    cpu_tensors = {}
+    for tensor in itertools.chain(module.parameters(), module.buffers()):
+        cpu_tensor = tensor.detach().to(torch.device(Devices.CPU_DEVICE), copy=True)
+        if isinstance(tensor, torch.nn.Parameter):
+            cpu_tensor = torch.nn.Parameter(
+                cpu_tensor, requires_grad=tensor.requires_grad
+            )
+        cpu_tensors[id(tensor)] = cpu_tensor
+    # deepcopy takes tensors already found in memo instead of copying them
+    return copy.deepcopy(module, cpu_tensors)
+
+
 def _save_context(
     model: torch.nn.Module, predictor: torch.nn.Module, context_save_dir: str
 ):
@@ -543,8 +599,16 @@ def _save_context(
         model (torch.nn.Module): A reference to the model.
         predictor (torch.nn.Module): A reference to the predictor.
     """
-    torch.save(model, context_save_dir + Context.MODEL_NAME)
-    torch.save(predictor, context_save_dir + Context.PREDICTOR_NAME)
+    torch.save(
+        model,
+        context_save_dir + Context.MODEL_NAME,
+        pickle_protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    torch.save(
+        predictor,
+        context_save_dir + Context.PREDICTOR_NAME,
+        pickle_protocol=pickle.HIGHEST_PROTOCOL,
+    )
 
 
 def inner_predict(
@@ -1,9 +1,7 @@
 import dgl
-import dgl.function as fn
 import torch
 import torch.nn as nn
-from typing import Dict
-from mage.link_prediction.constants import Predictors
+from typing import Dict, Tuple
 
 
 class DotPredictor(nn.Module):
@@ -24,33 +22,70 @@ class DotPredictor(nn.Module):
         Returns:
             torch.Tensor: A tensor of edge scores.
         """
-        with g.local_scope():
-            for node_type in node_embeddings.keys():  # Iterate over all node_types.
-                g.nodes[node_type].data[Predictors.NODE_EMBEDDINGS] = node_embeddings[
-                    node_type
-                ]
+        src_type, dest_type, src_nodes, dest_nodes = self._endpoints(g, target_relation)
+        return self._scores(node_embeddings, src_type, dest_type, src_nodes, dest_nodes)
 
-            # Compute a new edge feature named 'score' by a dot-product between the
-            # embedding of source node and embedding of destination node.
-            g.apply_edges(
-                fn.u_dot_v(
-                    Predictors.NODE_EMBEDDINGS,
-                    Predictors.NODE_EMBEDDINGS,
-                    Predictors.EDGE_SCORE,
-                ),
-                etype=target_relation,
-            )
-            scores = g.edata[Predictors.EDGE_SCORE]
-            if type(scores) != dict:
-                return scores.view(-1)
+    def forward_pos_neg(
+        self,
+        pos_graph: dgl.graph,
+        neg_graph: dgl.graph,
+        node_embeddings: Dict[str, torch.Tensor],
+        target_relation: str = None,
+    ) -> Tuple[torch.Tensor, int]:
+        """Scores positive and negative graph in a single pass. Both graphs share the node embeddings, so their edges of
+        the target relation are stacked and scored together.
+
+        Args:
+            pos_graph (dgl.graph): A reference to the positive graph.
+            neg_graph (dgl.graph): A reference to the negative graph.
+            node_embeddings: (Dict[str, torch.Tensor]): Node embeddings for each node type.
+            target_relation: str -> Unique edge type that is used for training.
+
+        Returns:
+            Tuple[torch.Tensor, int]: Scores of positive edges followed by scores of negative edges and the number of positive edges.
+        """
+        src_type, dest_type, pos_src, pos_dest = self._endpoints(
+            pos_graph, target_relation
+        )
+        _, _, neg_src, neg_dest = self._endpoints(neg_graph, target_relation)
+        scores = self._scores(
+            node_embeddings,
+            src_type,
+            dest_type,
+            torch.cat([pos_src, neg_src]),
+            torch.cat([pos_dest, neg_dest]),
+        )
+        return scores, pos_src.shape[0]
 
-            if type(target_relation) == tuple:  # Tuple[str, str, str] identification
-                return scores[target_relation].view(-1)
+    @staticmethod
+    def _endpoints(
+        g: dgl.graph, target_relation: str
+    ) -> Tuple[str, str, torch.Tensor, torch.Tensor]:
+        """Returns source node type, destination node type, source and destination nodes of the target relation edges."""
+        canonical_etype = (
+            g.canonical_etypes[0]  # homogeneous graph
+            if target_relation is None
+            else g.to_canonical_etype(target_relation)
+        )
+        src_type, _, dest_type = canonical_etype
+        src_nodes, dest_nodes = g.edges(etype=canonical_etype)
+        return src_type, dest_type, src_nodes, dest_nodes
 
-            if type(target_relation) == str:  # edge type identification
-                for key, val in scores.items():
-                    if key[1] == target_relation:
-                        return val.view(-1)
+    @staticmethod
+    def _scores(
+        node_embeddings: Dict[str, torch.Tensor],
+        src_type: str,
+        dest_type: str,
+        src_nodes: torch.Tensor,
+        dest_nodes: torch.Tensor,
+    ) -> torch.Tensor:
+        """Dot product between the embedding of source node and embedding of destination node for each edge. Computed as
+        a batched matrix product, so the elementwise product of the two embedding matrices is never materialized."""
+        return torch.einsum(
+            "ij,ij->i",
+            node_embeddings[src_type][src_nodes],
+            node_embeddings[dest_type][dest_nodes],
+        )
 
     def forward_pred(
         self, src_embedding: torch.Tensor, dest_embedding: torch.Tensor
@@ -51,18 +51,32 @@ class MLPPredictor(torch.nn.Module):
                 ]
 
             g.apply_edges(self.apply_edges, etype=target_relation)
-            scores = g.edata[Predictors.EDGE_SCORE]
+            if target_relation is None:  # homogeneous graph
+                return g.edata[Predictors.EDGE_SCORE].view(-1)
 
-            if type(scores) != dict:
-                return scores.view(-1)
+            # DGL resolves both edge type and Tuple[str, str, str] identification
+            return g.edges[target_relation].data[Predictors.EDGE_SCORE].view(-1)
 
-            if type(target_relation) == tuple:  # Tuple[str, str, str] identification
-                return scores[target_relation].view(-1)
+    def forward_pos_neg(
+        self,
+        pos_graph: dgl.graph,
+        neg_graph: dgl.graph,
+        node_embeddings: Dict[str, torch.Tensor],
+        target_relation: str = None,
+    ) -> Tuple[torch.Tensor, int]:
+        """Calculates forward pass of MLPPredictor for positive and negative graph.
 
-            if type(target_relation) == str:  # edge type identification
-                for key, val in scores.items():
-                    if key[1] == target_relation:
-                        return val.view(-1)
+        Args:
+            pos_graph (dgl.graph): A reference to the positive graph.
+            neg_graph (dgl.graph): A reference to the negative graph.
+            node_embeddings (Dict[str, torch.Tensor]): node embeddings for each node type.
+            target_relation: str -> Unique edge type that is used for training.
+        Returns:
+            Tuple[torch.Tensor, int]: Scores of positive edges followed by scores of negative edges and the number of positive edges.
+        """
+        pos_score = self.forward(pos_graph, node_embeddings, target_relation)
+        neg_score = self.forward(neg_graph, node_embeddings, target_relation)
+        return torch.cat([pos_score, neg_score]), pos_score.shape[0]
 
     def forward_pred(
         self, src_embedding: torch.Tensor, dest_embedding: torch.Tensor
@@ -16,9 +16,13 @@ class Memory:
     # https://stackoverflow.com/questions/48274929/pytorch-runtimeerror-trying-to-backward-through-the-graph-a-second
     # -time-but
     def detach_tensor_grads(self):
-        for node_memory in self.memory_container.values():
+        for node, node_memory in self.memory_container.items():
             if node_memory.grad is not None:
                 node_memory.grad.zero_()
+            # updated memory is output of memory updater and holds graph of all previous batches,
+            # detach it so that graph can be freed
+            if node_memory.grad_fn is not None:
+                self.memory_container[node] = node_memory.detach()
 
         for timestamp in self.last_node_update.values():
             if timestamp.grad is not None:
@@ -2,6 +2,10 @@ import numpy as np
 import torch
 
 
+def detach_non_leaf(tensor: torch.Tensor) -> torch.Tensor:
+    return tensor.detach() if tensor.grad_fn is not None else tensor
+
+
 class RawMessage:
     """
     Raw Message class is a container for information needed to compute message from Node-wise event and Interaction-wise
@@ -63,6 +67,13 @@ class InteractionRawMessage(RawMessage):
         self.edge_features = edge_features
 
     def detach_memory(self) -> None:
+        # memories and delta time are outputs of memory updater of previous batches, detach them so that
+        # graph of previous batches can be freed, since message store keeps messages until end of epoch
+        self.source_memory = detach_non_leaf(self.source_memory)
+        self.dest_memory = detach_non_leaf(self.dest_memory)
+        self.delta_time = detach_non_leaf(self.delta_time)
+        self.edge_features = detach_non_leaf(self.edge_features)
+
         if self.source_memory.grad is not None:
             self.source_memory.detach_()
             self.source_memory.zero_()
@@ -25,8 +25,13 @@ class RawMessageStore:
                 message.detach_memory()
 
     def get_messages(self) -> Dict[int, List[RawMessage]]:
+        """
+        Returns the store's own container without copying it. Callers only read it, and the store keeps
+        appending to the same container until init_message_store replaces it.
+        """
         return self.message_container
 
     def update_messages(self, new_node_messages: Dict[int, List[RawMessage]]) -> None:
-        for node in new_node_messages:
-            self.message_container[node].extend(new_node_messages[node])
+        message_container = self.message_container
+        for node, messages in new_node_messages.items():
+            message_container[node] += messages
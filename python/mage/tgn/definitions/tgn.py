@@ -481,17 +481,18 @@ class TGN(nn.Module):
         return (
             self.edge_features[edge_idx]
             if edge_idx in self.edge_features
-            else torch.rand(
-                self.num_edge_features, requires_grad=True, device=self.device
-            )
+            else torch.rand(self.num_edge_features, device=self.device)
         )
 
     def _get_edges_features(self, edge_idxs: List[int]) -> torch.Tensor:
         edges_features = torch.zeros(
             self.num_neighbors, self.num_edge_features, device=self.device
         )
-        for i, edge_idx in enumerate(edge_idxs):
-            edges_features[i, :] = self._get_edge_features(edge_idx)
+        if len(edge_idxs) > 0:
+            # gather all rows and copy them in one go instead of row by row
+            edges_features[: len(edge_idxs)] = torch.stack(
+                [self._get_edge_features(edge_idx) for edge_idx in edge_idxs]
+            )
         return edges_features
 
     def _get_graph_data(self, nodes: np.array, timestamps: np.array) -> GraphDataType:
@@ -528,19 +529,19 @@ class TGN(nn.Module):
             device=self.device,
         )
 
-        for i, (node, _) in enumerate(nodes):
+        node_features_rows = []
+        for node, _ in nodes:
             node_feature = (
                 self.node_features[node]
                 if node in self.node_features
-                else torch.zeros(
-                    self.num_node_features, requires_grad=True, device=self.device
-                )
+                else torch.zeros(self.num_node_features, device=self.device)
             )
-            node_memory = torch.tensor(
-                self.memory.get_node_memory(node).cpu().detach().numpy(),
-                device=self.device,
-            )
-            node_features[i, :] = torch.concat((node_memory, node_feature))
+            # detached copy of memory, no round trip through host memory
+            node_memory = self.memory.get_node_memory(node).detach().clone()
+            node_features_rows.append(torch.concat((node_memory, node_feature)))
+
+        if node_features_rows:
+            node_features[:] = torch.stack(node_features_rows)
 
         edge_features = [
             self._get_edges_features(node_neighbors)
@@ -0,0 +1,45 @@
+from typing import Set, Tuple, Union
+
+import numpy as np
+
+
+class NegativeSampler:
+    """
+    Keeps unique sources and destinations of all edges seen so far. Negative sources are sampled from sources and
+    negative destinations from destinations, uniformly and with replacement. Sets are converted to arrays only after
+    new nodes are added.
+    """
+
+    def __init__(self, rng: Union[None, np.random.Generator] = None):
+        self.rng = np.random.default_rng() if rng is None else rng
+        self.reset()
+
+    def reset(self) -> None:
+        self.all_sources: Set[int] = set()
+        self.all_destinations: Set[int] = set()
+        self._candidates: Union[None, Tuple[np.array, np.array]] = None
+
+    def add_edge(self, source: int, destination: int) -> None:
+        if source not in self.all_sources:
+            self.all_sources.add(source)
+            self._candidates = None
+        if destination not in self.all_destinations:
+            self.all_destinations.add(destination)
+            self._candidates = None
+
+    def get_candidates(self) -> Tuple[np.array, np.array]:
+        if self._candidates is None:
+            self._candidates = (
+                np.fromiter(self.all_sources, dtype=int),
+                np.fromiter(self.all_destinations, dtype=int),
+            )
+        return self._candidates
+
+    def sample(self, negative_num: int) -> Tuple[np.array, np.array]:
+        all_src, all_dest = self.get_candidates()
+
+        # uniform sampling with replacement is the same as sampling indices uniformly
+        return (
+            all_src[self.rng.integers(0, len(all_src), size=negative_num)],
+            all_dest[self.rng.integers(0, len(all_dest), size=negative_num)],
+        )
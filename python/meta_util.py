@@ -1,7 +1,7 @@
 import mgp
 from mage.meta_util.parameters import Parameter
-from collections import defaultdict
-from typing import Dict, Tuple, Union, Iterator
+import collections
+from typing import Dict, Iterable, Tuple, Union, Iterator
 
 
 NodeKeyType = Tuple[str, ...]
@@ -11,13 +11,13 @@ RelationshipKeyType = Tuple[NodeKeyType, str, NodeKeyType]
 class Counter:
     def __init__(self, initial_value: int = 0):
         self.total_count = initial_value
-        self.count_by_property_name = defaultdict(int)
+        self.count_by_property_name = collections.Counter()
 
     def increment(self) -> None:
         self.total_count += 1
 
-    def increment_property(self, property_name: str) -> None:
-        self.count_by_property_name[property_name] += 1
+    def increment_properties(self, property_names: Iterable[str]) -> None:
+        self.count_by_property_name.update(property_names)
 
     def to_dict(self, include_properties):
         return (
@@ -54,11 +54,13 @@ def schema(
     node_count_by_labels: Dict[NodeKeyType, Counter] = {}
     relationship_count_by_labels: Dict[RelationshipKeyType, Counter] = {}
 
+    labels_by_vertex_id: Dict[int, NodeKeyType] = {}
+
     node_counter = 0
 
     for node in context.graph.vertices:
         node_counter += 1
-        labels = tuple(sorted(label.name for label in node.labels))
+        labels = _get_labels(node, labels_by_vertex_id)
         _update_counts(
             node_count_by_labels,
             key=labels,
@@ -67,9 +69,7 @@ def schema(
         )
 
         for relationship in node.out_edges:
-            target_labels = tuple(
-                sorted(label.name for label in relationship.to_vertex.labels)
-            )
+            target_labels = _get_labels(relationship.to_vertex, labels_by_vertex_id)
             key = (labels, relationship.type.name, target_labels)
             _update_counts(
                 relationship_count_by_labels,
@@ -100,6 +100,17 @@ def schema(
     return mgp.Record(nodes=nodes, relationships=relationships)
 
 
+def _get_labels(
+    vertex: mgp.Vertex, labels_by_vertex_id: Dict[int, NodeKeyType]
+) -> NodeKeyType:
+    labels = labels_by_vertex_id.get(vertex.id)
+    if labels is None:
+        labels = tuple(sorted(label.name for label in vertex.labels))
+        labels_by_vertex_id[vertex.id] = labels
+
+    return labels
+
+
 def _update_counts(
     obj_count_by_key: Dict[Union[NodeKeyType, RelationshipKeyType], Counter],
     key: Union[NodeKeyType, RelationshipKeyType],
@@ -113,8 +124,7 @@ def _update_counts(
     obj_counter.increment()
 
     if include_properties:
-        for property_name in obj.properties.keys():
-            obj_counter.increment_property(property_name)
+        obj_counter.increment_properties(obj.properties.keys())
 
 
 def _iter_nodes_as_map(
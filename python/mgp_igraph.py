@@ -197,11 +197,10 @@ class MemgraphIgraph(igraph.Graph):
         vertex_attrs = defaultdict(list)
         edge_list = []
         edge_attrs = defaultdict(list)
-        id_mapping = {vertex.id: i for i, vertex in enumerate(ctx.graph.vertices)}
-        inverted_id_mapping = {
-            i: vertex.id for i, vertex in enumerate(ctx.graph.vertices)
-        }
-        for vertex in ctx.graph.vertices:
+        vertices = list(ctx.graph.vertices)
+        inverted_id_mapping = dict(enumerate(vertex.id for vertex in vertices))
+        id_mapping = {vertex_id: i for i, vertex_id in inverted_id_mapping.items()}
+        for vertex in vertices:
             for name, value in vertex.properties.items():
                 vertex_attrs[name].append(value)
             for edge in vertex.out_edges:
@@ -213,7 +212,7 @@ class MemgraphIgraph(igraph.Graph):
 
         super().__init__(
             directed=directed,
-            n=len(ctx.graph.vertices),
+            n=len(vertices),
             edges=edge_list,
             edge_attrs=edge_attrs,
             vertex_attrs=vertex_attrs,
@@ -4,17 +4,32 @@ import datetime
 from mage.date.constants import Epoch
 
 
+def _format_point_in_time(temporal, format: str) -> str:
+    if format == "ISO":
+        return temporal.isoformat()
+
+    return temporal.strftime(format)
+
+
+def _format_duration(temporal: datetime.timedelta, format: str) -> str:
+    return (Epoch.UNIX_EPOCH + temporal).strftime(format)
+
+
+TEMPORAL_FORMATTERS = {
+    datetime.datetime: _format_point_in_time,
+    datetime.date: _format_point_in_time,
+    datetime.time: _format_point_in_time,
+    datetime.timedelta: _format_duration,
+}
+
+
 @mgp.read_proc
 def format(
     temporal: mgp.Any,
     format: str = "ISO",
 ) -> mgp.Record(formatted=str):
-    if not (
-        isinstance(temporal, datetime.datetime)
-        or isinstance(temporal, datetime.date)
-        or isinstance(temporal, datetime.time)
-        or isinstance(temporal, datetime.timedelta)
-    ):
+    formatter = TEMPORAL_FORMATTERS.get(type(temporal))
+    if formatter is None:
         return mgp.Record(formatted=str(temporal))
 
     if "%z" in format or "%Z" in format:
@@ -23,14 +38,4 @@ def format(
             '%Z' in format is not supported."
         )
 
-    if format == "ISO" and (
-        isinstance(temporal, datetime.datetime)
-        or isinstance(temporal, datetime.date)
-        or isinstance(temporal, datetime.time)
-    ):
-        return mgp.Record(formatted=temporal.isoformat())
-
-    if isinstance(temporal, datetime.timedelta):
-        temporal = Epoch.UNIX_EPOCH + temporal
-
-    return mgp.Record(formatted=temporal.strftime(format))
+    return mgp.Record(formatted=formatter(temporal, format))
@@ -0,0 +1,63 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("dgl")
+pytest.importorskip("sklearn")
+
+from mage.link_prediction.constants import Metrics  # noqa: E402
+from mage.link_prediction.link_prediction_util import evaluate  # noqa: E402
+
+COUNT_METRICS = [
+    Metrics.POS_PRED_EXAMPLES,
+    Metrics.NEG_PRED_EXAMPLES,
+    Metrics.POS_EXAMPLES,
+    Metrics.NEG_EXAMPLES,
+    Metrics.TRUE_POSITIVES,
+    Metrics.FALSE_POSITIVES,
+    Metrics.TRUE_NEGATIVES,
+    Metrics.FALSE_NEGATIVES,
+]
+
+SCORE_METRICS = [
+    Metrics.ACCURACY,
+    Metrics.AUC_SCORE,
+    Metrics.F1,
+    Metrics.PRECISION,
+    Metrics.RECALL,
+]
+
+
+@pytest.fixture
+def epoch_result():
+    labels = torch.tensor([1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+    probs = torch.tensor([0.9, 0.8, 0.3, 0.7, 0.2, 0.1, 0.4, 0.6])
+    return evaluate(
+        COUNT_METRICS + SCORE_METRICS, labels, probs, 0.5, epoch=3, loss=0.25
+    )
+
+
+def test_counts_are_epoch_totals(epoch_result):
+    assert epoch_result[Metrics.TRUE_POSITIVES] == 2
+    assert epoch_result[Metrics.FALSE_POSITIVES] == 2
+    assert epoch_result[Metrics.TRUE_NEGATIVES] == 3
+    assert epoch_result[Metrics.FALSE_NEGATIVES] == 1
+    assert epoch_result[Metrics.POS_PRED_EXAMPLES] == 4
+    assert epoch_result[Metrics.NEG_PRED_EXAMPLES] == 4
+    assert epoch_result[Metrics.POS_EXAMPLES] == 3
+    assert epoch_result[Metrics.NEG_EXAMPLES] == 5
+
+
+def test_counts_are_python_ints(epoch_result):
+    for metric in COUNT_METRICS:
+        assert type(epoch_result[metric]) is int
+
+
+def test_scores_are_python_floats(epoch_result):
+    for metric in SCORE_METRICS:
+        assert type(epoch_result[metric]) is float
+    assert epoch_result[Metrics.ACCURACY] == pytest.approx(5 / 8)
+
+
+def test_epoch_and_loss_are_kept(epoch_result):
+    assert epoch_result[Metrics.EPOCH] == 3
+    assert epoch_result[Metrics.LOSS] == 0.25
@@ -0,0 +1,48 @@
+from mage.tgn.helper.negative_sampling import NegativeSampler
+
+import numpy as np
+import pytest
+
+EDGES = [(0, 1), (0, 2), (3, 1), (4, 5)]
+NEGATIVE_NUM = 100
+
+
+@pytest.fixture
+def negative_sampler():
+    sampler = NegativeSampler(rng=np.random.default_rng(0))
+    for source, destination in EDGES:
+        sampler.add_edge(source, destination)
+    return sampler
+
+
+class TestNegativeSampler:
+    def test_sampled_from_correct_sets(self, negative_sampler):
+        sources, destinations = negative_sampler.sample(NEGATIVE_NUM)
+
+        assert len(sources) == NEGATIVE_NUM
+        assert len(destinations) == NEGATIVE_NUM
+        assert set(sources.tolist()) <= {0, 3, 4}
+        assert set(destinations.tolist()) <= {1, 2, 5}
+
+    def test_candidates_cached(self, negative_sampler):
+        candidates = negative_sampler.get_candidates()
+        negative_sampler.add_edge(0, 1)
+
+        assert negative_sampler.get_candidates() is candidates
+
+    def test_candidates_refreshed_on_new_nodes(self, negative_sampler):
+        negative_sampler.sample(NEGATIVE_NUM)
+        negative_sampler.add_edge(6, 7)
+        sources, destinations = negative_sampler.get_candidates()
+
+        assert set(sources.tolist()) == {0, 3, 4, 6}
+        assert set(destinations.tolist()) == {1, 2, 5, 7}
+
+    def test_candidates_refreshed_on_reset(self, negative_sampler):
+        negative_sampler.sample(NEGATIVE_NUM)
+        negative_sampler.reset()
+        negative_sampler.add_edge(10, 11)
+        sources, destinations = negative_sampler.sample(NEGATIVE_NUM)
+
+        assert set(sources.tolist()) == {10}
+        assert set(destinations.tolist()) == {11}
@@ -0,0 +1,64 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from mage.tgn.definitions.messages import InteractionRawMessage  # noqa: E402
+from mage.tgn.definitions.raw_message_store import RawMessageStore  # noqa: E402
+
+MEMORY_DIMENSION = 4
+EDGE_FEATURES_DIMENSION = 2
+
+
+def updated_memory() -> torch.Tensor:
+    # memory updated by memory updater is not a leaf and holds graph of previous batches
+    memory = torch.zeros(MEMORY_DIMENSION, requires_grad=True)
+    return memory * 2
+
+
+@pytest.fixture
+def raw_message_store():
+    store = RawMessageStore(
+        edge_raw_message_dimension=2 * MEMORY_DIMENSION + EDGE_FEATURES_DIMENSION + 1,
+        node_raw_message_dimension=MEMORY_DIMENSION,
+    )
+    last_update = torch.zeros(1, requires_grad=True)
+    store.update_messages(
+        {
+            0: [
+                InteractionRawMessage(
+                    source_memory=updated_memory(),
+                    dest_memory=updated_memory(),
+                    delta_time=torch.tensor(1.0, requires_grad=True) - last_update,
+                    edge_features=torch.ones(EDGE_FEATURES_DIMENSION),
+                    source=0,
+                    timestamp=1,
+                )
+            ]
+        }
+    )
+    return store
+
+
+class TestRawMessageStore:
+    def test_messages_hold_graph(self, raw_message_store):
+        (message,) = raw_message_store.get_messages()[0]
+
+        assert message.source_memory.grad_fn is not None
+        assert message.dest_memory.grad_fn is not None
+        assert message.delta_time.grad_fn is not None
+
+    def test_detach_grads(self, raw_message_store):
+        raw_message_store.detach_grads()
+        (message,) = raw_message_store.get_messages()[0]
+
+        assert message.source_memory.grad_fn is None
+        assert message.dest_memory.grad_fn is None
+        assert message.delta_time.grad_fn is None
+        assert message.edge_features.grad_fn is None
+
+    def test_detach_grads_keeps_values(self, raw_message_store):
+        raw_message_store.detach_grads()
+        (message,) = raw_message_store.get_messages()[0]
+
+        assert torch.equal(message.source_memory, torch.zeros(MEMORY_DIMENSION))
+        assert torch.equal(message.delta_time, torch.tensor([1.0]))
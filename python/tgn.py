@@ -62,9 +62,10 @@ What we believe we did and author probably failed to do:
 
 import dataclasses
 import enum
+import logging
 import time
 from math import ceil
-from typing import Dict, Tuple, Set, List, Any, Union
+from typing import Dict, Tuple, List, Any, Type, Union
 
 import mgp
 
@@ -80,6 +81,7 @@ from mage.tgn.constants import (
 )
 from mage.tgn.definitions.tgn import TGN
 
+from mage.tgn.helper.negative_sampling import NegativeSampler
 from mage.tgn.helper.simple_mlp import MLP
 
 from mage.tgn.definitions.instances import (
@@ -152,11 +154,11 @@ class QueryModuleTGN:
     optimizer: torch.optim.Adam
     device: torch.device
     m_loss: List[float]  # mean loss
-    mlp: MLP
+    mlp: Union[MLP, torch.jit.ScriptModule]
     tgn_mode: TGNMode
     learning_type: LearningType
-    # used in negative sampling for self_supervised
-    all_edges: Set[Tuple[int, int]]
+    # unique sources and destinations of all edges, used in negative sampling for self_supervised
+    negative_sampler: NegativeSampler
     # to get all embeddings
     all_embeddings: Dict[int, np.array]
     results_per_epochs: Dict[int, List[mgp.Record]]
@@ -169,14 +171,14 @@ class QueryModuleTGN:
 @dataclasses.dataclass
 class QueryModuleTGNBatch:
     current_batch_size: int
-    sources: np.array
-    destinations: np.array
-    timestamps: np.array
-    edge_idxs: np.array
+    sources: List[int]
+    destinations: List[int]
+    timestamps: List[int]
+    edge_idxs: List[int]
     node_features: Dict[int, torch.Tensor]
     edge_features: Dict[int, torch.Tensor]
     batch_size: int
-    labels: np.array
+    labels: List[Tuple[int, int]]
 
 
 ##############################
@@ -187,6 +189,8 @@ class QueryModuleTGNBatch:
 query_module_tgn: QueryModuleTGN
 query_module_tgn_batch: QueryModuleTGNBatch
 
+logger = logging.getLogger("tgn")
+
 ##############################
 # constants
 ##############################
@@ -349,7 +353,7 @@ def set_tgn(
         mlp=mlp,
         tgn_mode=TGNMode.Train,  # we start in train mode
         learning_type=learning_type,
-        all_edges=set(),
+        negative_sampler=NegativeSampler(),
         all_embeddings={},
         results_per_epochs={},
         current_epoch=EPOCH_START,
@@ -382,7 +386,10 @@ def get_tgn_self_supervised(
         config[TGNParameters.MEMORY_DIMENSION] + config[TGNParameters.NUM_NODE_FEATURES]
     ) * 2
 
-    mlp = MLP([mlp_in_features_dim, mlp_in_features_dim // 2, 1]).to(device=device)
+    # scripted so the scoring head runs without Python dispatch between its layers
+    mlp = torch.jit.script(
+        MLP([mlp_in_features_dim, mlp_in_features_dim // 2, 1]).to(device=device)
+    )
 
     return tgn, mlp
 
@@ -400,7 +407,7 @@ def get_tgn_supervised(config: Dict[str, Any], device: torch.device) -> Tuple[TG
     )
 
     # used as probability calculator for label
-    mlp = MLP([mlp_in_features_dim, 64, 1]).to(device=device)
+    mlp = torch.jit.script(MLP([mlp_in_features_dim, 64, 1]).to(device=device))
 
     return tgn, mlp
 
@@ -416,18 +423,25 @@ def sample_negative(negative_num: int) -> Tuple[np.array, np.array]:
     source-dest pair that are real edges
     """
     global query_module_tgn
-    all_edges = query_module_tgn.all_edges
-    all_src = list(set([src for src, dest in all_edges]))
-    all_dest = list(set([src for src, dest in all_edges]))
-
-    return np.random.choice(all_src, negative_num, replace=True), np.random.choice(
-        all_dest, negative_num, replace=True
-    )
+    return query_module_tgn.negative_sampler.sample(negative_num)
 
 
 def unpack_tgn_batch_data():
     global query_module_tgn_batch
-    return dataclasses.astuple(query_module_tgn_batch)
+    # edges are collected in lists while the batch fills up and converted to arrays only once it is processed
+    return (
+        query_module_tgn_batch.current_batch_size,
+        np.array(query_module_tgn_batch.sources, dtype=int),
+        np.array(query_module_tgn_batch.destinations, dtype=int),
+        np.array(query_module_tgn_batch.timestamps, dtype=int),
+        np.array(query_module_tgn_batch.edge_idxs, dtype=int),
+        query_module_tgn_batch.node_features,
+        query_module_tgn_batch.edge_features,
+        query_module_tgn_batch.batch_size,
+        np.array(query_module_tgn_batch.labels)
+        if query_module_tgn_batch.labels
+        else np.empty((0, 2), dtype=int),
+    )
 
 
 def update_mode_reset_grads_check_dims() -> None:
@@ -467,17 +481,18 @@ def update_mode_reset_grads_check_dims() -> None:
 
 
 def update_embeddings(
-    embeddings_source: np.array,
-    embeddings_dest: np.array,
+    embeddings_source: torch.Tensor,
+    embeddings_dest: torch.Tensor,
     sources: np.array,
     destinations: np.array,
 ) -> None:
     global query_module_tgn
-    for i, node in enumerate(sources):
-        query_module_tgn.all_embeddings[node] = embeddings_source[i]
-
-    for i, node in enumerate(destinations):
-        query_module_tgn.all_embeddings[node] = embeddings_dest[i]
+    # one transfer from the device for all embeddings, destinations come last so for nodes
+    # appearing multiple times the last embedding is kept
+    embeddings = torch.cat([embeddings_source, embeddings_dest]).detach().cpu().numpy()
+    query_module_tgn.all_embeddings.update(
+        zip(np.concatenate([sources, destinations]).tolist(), embeddings)
+    )
 
 
 #
@@ -540,28 +555,22 @@ def process_batch_self_supervised() -> float:
     pos_prob, neg_prob = pos_score.sigmoid(), neg_score.sigmoid()
 
     if query_module_tgn.tgn_mode == TGNMode.Train:
-        pos_label = torch.ones(
-            current_batch_size, dtype=torch.float, device=query_module_tgn.device
-        )
-        neg_label = torch.zeros(
-            current_batch_size, dtype=torch.float, device=query_module_tgn.device
-        )
+        device, criterion = query_module_tgn.device, query_module_tgn.criterion
+        pos_label = torch.ones(current_batch_size, dtype=torch.float, device=device)
+        neg_label = torch.zeros(current_batch_size, dtype=torch.float, device=device)
         # use reshape to get 1 dimension in every case
-        loss = query_module_tgn.criterion(
-            pos_prob.reshape((-1,)), pos_label
-        ) + query_module_tgn.criterion(neg_prob.reshape((-1,)), neg_label)
+        loss = criterion(pos_prob.reshape((-1,)), pos_label) + criterion(
+            neg_prob.reshape((-1,)), neg_label
+        )
 
         loss.backward()
         query_module_tgn.optimizer.step()
         query_module_tgn.m_loss.append(loss.item())
     pos_prob_cpu = pos_prob.reshape((-1,)).detach().cpu()
     neg_prob_cpu = neg_prob.reshape((-1,)).detach().cpu()
-    # todo antoniofilipovic - update once we have logging API
-    print(
-        "POS PROB | NEG PROB",
-        pos_prob_cpu,
-        neg_prob_cpu,
-    )
+    # formatting whole tensors is expensive, so do it only when it is logged
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("POS PROB | NEG PROB %s %s", pos_prob_cpu, neg_prob_cpu)
     pred_score = np.concatenate(
         [
             pos_prob_cpu.numpy(),
@@ -580,12 +589,7 @@ def process_batch_self_supervised() -> float:
     )
 
     # update embeddings to the newest ones that we can return on user request
-    update_embeddings(
-        embeddings_source.detach().cpu().numpy(),
-        embeddings_dest.detach().cpu().numpy(),
-        sources,
-        destinations,
-    )
+    update_embeddings(embeddings_source, embeddings_dest, sources, destinations)
 
     return precision
 
@@ -651,24 +655,14 @@ def process_batch_supervised() -> float:
     )
 
     # update embeddings to newest ones that we can return on user request
-    update_embeddings(
-        embeddings_source.detach().cpu().numpy(),
-        embeddings_dest.cpu().detach().cpu().numpy(),
-        sources,
-        destinations,
-    )
+    update_embeddings(embeddings_source, embeddings_dest, sources, destinations)
 
     if query_module_tgn.tgn_mode == TGNMode.Eval:
         return precision
 
     # backprop only in case of training
     with torch.no_grad():
-        src_label = torch.tensor(
-            labels[:, 0], dtype=torch.float, device=query_module_tgn.device
-        )
-        dest_label = torch.tensor(
-            labels[:, 1], dtype=torch.float, device=query_module_tgn.device
-        )
+        src_label, dest_label = to_device(labels).T
 
     loss = query_module_tgn.criterion(
         src_prob.squeeze(), src_label.squeeze()
@@ -680,81 +674,107 @@ def process_batch_supervised() -> float:
     return precision
 
 
-def create_torch_tensor(feature: Union[None, Tuple], num_features: int) -> torch.Tensor:
-    if feature is None:
-        np_feature = np.random.uniform(
-            0, 1, num_features
-        )  # uniformly sample features from 0 to 1
-    else:
-        np_feature = np.array(feature)
-    return torch.tensor(
-        np_feature,
-        requires_grad=True,
-        device=query_module_tgn.device,
-        dtype=torch.float,
-    )
+def to_device(array: np.array) -> torch.Tensor:
+    """
+    Moves array to the device as float tensor. On CUDA, array is staged in pinned memory so the copy
+    to the device is asynchronous and doesn't block until the tensor is actually used.
+    """
+    global query_module_tgn
+    tensor = torch.from_numpy(np.asarray(array, dtype=np.float32))
+    if query_module_tgn.device.type == "cuda":
+        return tensor.pin_memory().to(query_module_tgn.device, non_blocking=True)
+    return tensor
+
+
+def create_torch_tensors(
+    features: Dict[int, Union[None, Tuple]], num_features: int
+) -> Dict[int, torch.Tensor]:
+    """
+    Creates feature tensors for all given objects at once. Features of all objects are gathered in a single matrix,
+    missing ones are uniformly sampled from 0 to 1 in one call, and the matrix is moved to the device in one transfer.
+    Every object gets its own row of the matrix.
+    """
+    missing, present, present_features = [], [], []
+    for i, feature in enumerate(features.values()):
+        if feature is None:
+            missing.append(i)
+        else:
+            present.append(i)
+            present_features.append(feature)
+
+    np_features = np.empty((len(features), num_features))
+    np_features[missing] = np.random.uniform(0, 1, (len(missing), num_features))
+    if present:
+        # numpy converts all given features in one call
+        np_features[present] = present_features
+
+    torch_features = to_device(np_features)
+    # features are inputs and aren't optimized, so every object gets a row view of the batch matrix
+    return dict(zip(features.keys(), torch_features.unbind()))
 
 
 def parse_mgp_edges_into_tgn_batch(edges: mgp.List[mgp.Edge]) -> QueryModuleTGNBatch:
     global query_module_tgn_batch, query_module_tgn
 
+    node_features_property = query_module_tgn.memgraph_objects_properties[
+        MemgraphObjectsProperties.NODE_FEATURES_PROPERTY
+    ]
+    edge_features_property = query_module_tgn.memgraph_objects_properties[
+        MemgraphObjectsProperties.EDGE_FEATURES_PROPERTY
+    ]
+    node_label_property = query_module_tgn.memgraph_objects_properties[
+        MemgraphObjectsProperties.NODE_LABELS_PROPERTY
+    ]
+
+    # raw features of nodes and edges, converted to tensors for all edges at once
+    node_features: Dict[int, Union[None, Tuple]] = {}
+    edge_features: Dict[int, Union[None, Tuple]] = {}
+
+    # bound once, since they are used for every edge
+    batch = query_module_tgn_batch
+    negative_sampler = query_module_tgn.negative_sampler
+
     for edge in edges:
         source = edge.from_vertex
-        src_id = edge.from_vertex.id
+        source_properties = source.properties
+        src_id = source.id
 
         dest = edge.to_vertex
-        dest_id = int(edge.to_vertex.id)
+        dest_properties = dest.properties
+        dest_id = int(dest.id)
 
         # maybe this is not best practice, but since we are calling this
         # function only for processing of edges, we can also
-        # update all edges to for negative sampling later used later on
-        query_module_tgn.all_edges.add((src_id, dest_id))
+        # update all nodes for negative sampling later used later on
+        negative_sampler.add_edge(src_id, dest_id)
 
-        node_features_property = query_module_tgn.memgraph_objects_properties[
-            MemgraphObjectsProperties.NODE_FEATURES_PROPERTY
-        ]
-        edge_features_property = query_module_tgn.memgraph_objects_properties[
-            MemgraphObjectsProperties.EDGE_FEATURES_PROPERTY
-        ]
-        node_label_property = query_module_tgn.memgraph_objects_properties[
-            MemgraphObjectsProperties.NODE_LABELS_PROPERTY
-        ]
-        src_features = source.properties.get(node_features_property, None)
-        dest_features = dest.properties.get(node_features_property, None)
+        node_features[src_id] = source_properties.get(node_features_property, None)
+        node_features[dest_id] = dest_properties.get(node_features_property, None)
 
-        src_label = source.properties.get(node_label_property, 0)
-        dest_label = dest.properties.get(node_label_property, 0)
+        src_label = source_properties.get(node_label_property, 0)
+        dest_label = dest_properties.get(node_label_property, 0)
 
         timestamp = edge.id
-        edge_idx = int(edge.id)
+        edge_idx = int(timestamp)
 
-        edge_feature = edge.properties.get(edge_features_property, None)
+        edge_features[edge_idx] = edge.properties.get(edge_features_property, None)
 
-        query_module_tgn_batch.node_features[src_id] = create_torch_tensor(
-            src_features, query_module_tgn.config[TGNParameters.NUM_NODE_FEATURES]
-        )
-        query_module_tgn_batch.node_features[dest_id] = create_torch_tensor(
-            dest_features, query_module_tgn.config[TGNParameters.NUM_NODE_FEATURES]
-        )
-        query_module_tgn_batch.edge_features[edge_idx] = create_torch_tensor(
-            edge_feature, query_module_tgn.config[TGNParameters.NUM_EDGE_FEATURES]
-        )
+        batch.sources.append(src_id)
+        batch.destinations.append(dest_id)
+        batch.timestamps.append(timestamp)
+        batch.edge_idxs.append(edge_idx)
+        batch.labels.append((src_label, dest_label))
 
-        query_module_tgn_batch.sources = np.append(
-            query_module_tgn_batch.sources, src_id
-        )
-        query_module_tgn_batch.destinations = np.append(
-            query_module_tgn_batch.destinations, dest_id
-        )
-        query_module_tgn_batch.timestamps = np.append(
-            query_module_tgn_batch.timestamps, timestamp
+    query_module_tgn_batch.node_features.update(
+        create_torch_tensors(
+            node_features, query_module_tgn.config[TGNParameters.NUM_NODE_FEATURES]
         )
-        query_module_tgn_batch.edge_idxs = np.append(
-            query_module_tgn_batch.edge_idxs, edge_idx
-        )
-        query_module_tgn_batch.labels = np.append(
-            query_module_tgn_batch.labels, np.array([[src_label, dest_label]]), axis=0
+    )
+    query_module_tgn_batch.edge_features.update(
+        create_torch_tensors(
+            edge_features, query_module_tgn.config[TGNParameters.NUM_EDGE_FEATURES]
         )
+    )
     return query_module_tgn_batch
 
 
@@ -762,24 +782,29 @@ def reset_tgn_batch(batch_size: int) -> None:
     global query_module_tgn_batch
     query_module_tgn_batch = QueryModuleTGNBatch(
         0,
-        np.empty((0, 1), dtype=int),
-        np.empty((0, 1), dtype=int),
-        np.empty((0, 1), dtype=int),
-        np.empty((0, 1), dtype=int),
+        [],
+        [],
+        [],
+        [],
         {},
         {},
         batch_size,
-        np.empty((0, 2), dtype=int),
+        [],
     )
 
 
+def reset_negative_sampling() -> None:
+    global query_module_tgn
+    query_module_tgn.negative_sampler.reset()
+
+
 def reset_tgn() -> None:
     global query_module_tgn
 
     # reset whole tgn
     query_module_tgn.all_embeddings = {}
     reset_tgn_batch(0)
-    query_module_tgn.all_edges = set()
+    reset_negative_sampling()
 
 
 def process_epoch_batch() -> mgp.Record:
@@ -799,7 +824,8 @@ def process_epoch_batch() -> mgp.Record:
         batch_type=query_module_tgn.tgn_mode.name,
     )
 
-    # add same logging as in core
+    # add same logging as in core, this summary is shown to the user so it is printed,
+    # only debug diagnostics go to the logger
     print(
         f"EPOCH {get_current_epoch()} || BATCH {get_current_batch()}, | batch_process_time={batch_process_time}  | precision={precision}"
     )
@@ -837,7 +863,7 @@ def train_eval_epochs(
         query_module_tgn.tgn.init_temporal_neighborhood()
         query_module_tgn.tgn.init_message_store()
 
-        query_module_tgn.all_edges = set()
+        reset_negative_sampling()
         query_module_tgn.m_loss = []
 
         reset_tgn_batch(batch_size=batch_size)
@@ -1071,14 +1097,11 @@ def get(ctx: mgp.ProcCtx) -> mgp.Record(node=mgp.Vertex, embedding=mgp.List[floa
             "TGN is not initialized still. Call `set_params` function in order to initialize it."
         )
 
-    embeddings_dict = {}
-
-    for node_id, embedding in query_module_tgn.all_embeddings.items():
-        embeddings_dict[node_id] = [float(e) for e in embedding]
-
     return [
-        mgp.Record(node=ctx.graph.get_vertex_by_id(node_id), embedding=embedding)
-        for node_id, embedding in embeddings_dict.items()
+        mgp.Record(
+            node=ctx.graph.get_vertex_by_id(node_id), embedding=embedding.tolist()
+        )
+        for node_id, embedding in query_module_tgn.all_embeddings.items()
     ]
 
 
@@ -1216,7 +1239,7 @@ def set_params(
             return False
 
     params = {**DEFAULT_VALUES, **params}  # override any default parameters
-    print(params)
+    logger.debug("TGN parameters: %s", params)
     if not is_correctly_typed(DEFINED_INPUT_TYPES, params):
         raise Exception(
             f"Input dictionary is not correctly typed. Expected following types {DEFINED_INPUT_TYPES}."
@@ -1290,78 +1313,64 @@ def set_params(
 
 
 #####################################
+def get_enum_member(enum_type: Type[enum.Enum], value: str, error_message: str):
+    """
+    Constructs enum member from its value once. Every member is allowed, so a wrong value is the only error case.
+    """
+    try:
+        return enum_type(value)
+    except ValueError:
+        raise Exception(error_message)
+
+
 def get_tgn_layer_enum(layer_type: str) -> TGNLayerType:
-    if TGNLayerType(layer_type) is TGNLayerType.GraphAttentionEmbedding:
-        return TGNLayerType.GraphAttentionEmbedding
-    elif TGNLayerType(layer_type) is TGNLayerType.GraphSumEmbedding:
-        return TGNLayerType.GraphSumEmbedding
-    else:
-        raise Exception(
-            f"Wrong layer type, expected {TGNLayerType.GraphAttentionEmbedding} "
-            f"or {TGNLayerType.GraphSumEmbedding} "
-        )
+    return get_enum_member(
+        TGNLayerType,
+        layer_type,
+        f"Wrong layer type, expected {TGNLayerType.GraphAttentionEmbedding} "
+        f"or {TGNLayerType.GraphSumEmbedding} ",
+    )
 
 
 def get_edge_message_function_type(message_function_type: str) -> MessageFunctionType:
-    if MessageFunctionType(message_function_type) is MessageFunctionType.Identity:
-        return MessageFunctionType.Identity
-    elif MessageFunctionType(message_function_type) is MessageFunctionType.MLP:
-        return MessageFunctionType.MLP
-    else:
-        raise Exception(
-            f"Wrong message function type, expected {MessageFunctionType.Identity} "
-            f"or {MessageFunctionType.MLP} "
-        )
+    return get_enum_member(
+        MessageFunctionType,
+        message_function_type,
+        f"Wrong message function type, expected {MessageFunctionType.Identity} "
+        f"or {MessageFunctionType.MLP} ",
+    )
 
 
 def get_message_aggregator_type(message_aggregator_type: str) -> MessageAggregatorType:
-    if MessageAggregatorType(message_aggregator_type) is MessageAggregatorType.Mean:
-        return MessageAggregatorType.Mean
-    elif MessageAggregatorType(message_aggregator_type) is MessageAggregatorType.Last:
-        return MessageAggregatorType.Last
-    else:
-        raise Exception(
-            f"Wrong message aggregator type, expected {MessageAggregatorType.Last} "
-            f"or {MessageAggregatorType.Mean} "
-        )
+    return get_enum_member(
+        MessageAggregatorType,
+        message_aggregator_type,
+        f"Wrong message aggregator type, expected {MessageAggregatorType.Last} "
+        f"or {MessageAggregatorType.Mean} ",
+    )
 
 
 def get_memory_updater_type(memory_updater_type: str) -> MemoryUpdaterType:
-    if MemoryUpdaterType(memory_updater_type) is MemoryUpdaterType.GRU:
-        return MemoryUpdaterType.GRU
-
-    elif MemoryUpdaterType(memory_updater_type) is MemoryUpdaterType.RNN:
-        return MemoryUpdaterType.RNN
-
-    else:
-        raise Exception(
-            f"Wrong memory updater type, expected {MemoryUpdaterType.GRU} or"
-            f", {MemoryUpdaterType.RNN}"
-        )
+    return get_enum_member(
+        MemoryUpdaterType,
+        memory_updater_type,
+        f"Wrong memory updater type, expected {MemoryUpdaterType.GRU} or"
+        f", {MemoryUpdaterType.RNN}",
+    )
 
 
 def get_learning_type(learning_type: str) -> LearningType:
-    if LearningType(learning_type) is LearningType.SelfSupervised:
-        return LearningType.SelfSupervised
-
-    elif LearningType(learning_type) is LearningType.Supervised:
-        return LearningType.Supervised
-
-    else:
-        raise Exception(
-            f"Wrong learning type, expected {LearningType.Supervised} or"
-            f", {LearningType.SelfSupervised}"
-        )
+    return get_enum_member(
+        LearningType,
+        learning_type,
+        f"Wrong learning type, expected {LearningType.Supervised} or"
+        f", {LearningType.SelfSupervised}",
+    )
 
 
 def get_device_type(device_type: str) -> DeviceType:
-    if DeviceType(device_type) is DeviceType.CUDA:
-        return DeviceType.CUDA
-
-    elif DeviceType(device_type) is DeviceType.CPU:
-        return DeviceType.CPU
-
-    else:
-        raise Exception(
-            f"Wrong device type, expected {DeviceType.CUDA} or" f", {DeviceType.CPU}"
-        )
+    return get_enum_member(
+        DeviceType,
+        device_type,
+        f"Wrong device type, expected {DeviceType.CUDA} or" f", {DeviceType.CPU}",
+    )
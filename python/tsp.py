@@ -1,7 +1,10 @@
 import mgp
-from typing import List
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
 
 from mage.geography import (
+    LATITUDE,
+    LONGITUDE,
     solve_2_approx,
     solve_greedy,
     solve_1_5_approx,
@@ -15,6 +18,37 @@ tsp_solving_methods = {
     DEFAULT_SOLVING_METHOD: solve_1_5_approx,
 }
 
+Coordinates = Tuple[Tuple[str, float], ...]
+
+
+def _get_coordinates(vertex: mgp.Vertex) -> Coordinates:
+    """
+    Reads only the coordinate properties of the vertex, as hashable pairs of property name and value.
+    """
+    properties = vertex.properties
+    return tuple(
+        (name, properties.get(name))
+        for name in (LATITUDE, LONGITUDE)
+        if name in properties
+    )
+
+
+@lru_cache(maxsize=32)
+def _solve(
+    solver: Callable[..., List[int]], points: Tuple[Coordinates, ...]
+) -> Optional[Tuple[int, ...]]:
+    """
+    Solves tsp over the given coordinates. Results are cached by the coordinates themselves rather than by the
+    vertex ids, so a cached path is never returned after the vertices have moved, and order of indexes always
+    matches order of given points.
+    """
+    dm = create_distance_matrix([dict(coordinates) for coordinates in points])
+
+    if dm is None:
+        return None
+
+    return tuple(solver(dm))
+
 
 @mgp.read_proc
 def solve(
@@ -41,17 +75,17 @@ def solve(
     if not all(isinstance(x, mgp.Vertex) for x in points):
         return mgp.Record(sources=None, destinations=None)
 
-    dm = create_distance_matrix([dict(x.properties.items()) for x in points])
+    solver = tsp_solving_methods.get(
+        method.lower(), tsp_solving_methods[DEFAULT_SOLVING_METHOD]
+    )
 
-    if dm is None:
-        return mgp.Record(sources=None, destinations=None)
+    order = _solve(solver, tuple(_get_coordinates(x) for x in points))
 
-    if method.lower() not in tsp_solving_methods.keys():
-        method = DEFAULT_SOLVING_METHOD
-
-    order = tsp_solving_methods[method](dm)
+    if order is None:
+        return mgp.Record(sources=None, destinations=None)
 
-    sources = [points[order[x]] for x in range(len(order) - 1)]
-    destinations = [points[order[x]] for x in range(1, len(order))]
+    ordered_points = [points[i] for i in order]
+    sources = ordered_points[:-1]
+    destinations = ordered_points[1:]
 
     return mgp.Record(sources=sources, destinations=destinations)